@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
+from bisect import bisect_left
 from typing import Optional
-from config import HEIGHT
+from config import COMPLEMENT_TABLE
 
 
 @dataclass
@@ -46,6 +47,32 @@ class Node:
             child.positions.append(position)
 
         self._recurse_child(child, string, position, i + 1)
+
+
+    def find_factor(self, string, max_chain=None, min_position=0):
+        return find_factor(string, self, max_chain, min_position)
+
+
+    def find_both_strands(self, string, max_chain=None, min_position=0):
+        """
+        Looks up the string and its complement. Node paths are walked per base, so the tree
+        still takes one walk per strand.
+        """
+        return (find_factor(string, self, max_chain, min_position),
+                find_factor(string.translate(COMPLEMENT_TABLE), self, max_chain, min_position))
+
+
+    def prime(self, data, start, end):
+        """
+        Adds every position from start to end of data, a bytes-like object of ASCII bases.
+        """
+        height = 0
+        node = self
+        while node.a_branch:
+            node = node.a_branch
+            height += 1
+        for position in range(start, end):
+            self.create_positions(bytes(data[position:position + height]).decode("ascii"), position)
         
 
     def _recurse_child(self, child, string, position, i):
@@ -95,13 +122,26 @@ def create_tree(height):
     return root
 
 
-def find_factor(string, tree):
+def find_factor(string, tree, max_chain=None, min_position=0):
+    """
+    Walks the tree along the string, down to its leaves at most, and returns the deepest node's positions and level.
+
+    Args:
+        string (str): The DNA sequence to look up.
+        tree (Node): The root of the tree.
+        max_chain (int, optional): Keep at most this many of the newest leaf positions. Defaults to all.
+        min_position (int, optional): Drop leaf positions before this one. Defaults to 0.
+
+    Returns:
+        tuple: (positions, level) of the deepest match, or (None, None).
+    """
     curr = tree
     last_pos: Optional[list[int]] = None
     last_level: Optional[int] = None
 
-    steps = min(HEIGHT, len(string))
-    for i in range(steps):
+    for base in string:
+        if curr.is_leaf:
+            break
         mapping = {
             "A": curr.a_branch,
             "C": curr.c_branch,
@@ -109,14 +149,20 @@ def find_factor(string, tree):
             "G": curr.g_branch,
         }
 
-        next_curr = mapping.get(string[i])
+        next_curr = mapping.get(base)
         if next_curr is None:
             return (None, None) 
 
         curr = next_curr
+        positions = curr.positions
+
+        if curr.is_leaf and (max_chain or min_position): #leaf positions are in ascending order
+            if max_chain:
+                positions = positions[-max_chain:]
+            positions = positions[bisect_left(positions, min_position):]
 
-        if curr.positions:
-            last_pos = curr.positions
+        if positions:
+            last_pos = positions
             last_level = curr.level
         else:
             if last_pos is not None and last_level is not None:
@@ -0,0 +1,99 @@
+from config import DNA_FILE_TXT, DNA_FILE_PATH, INDEX_MODE, LEVELS, WINDOW, AUTOTUNE_HEIGHTS, AUTOTUNE_SAMPLES, \
+    AUTOTUNE_SAMPLE_SIZE, AUTOTUNE_MEMORY, AUTOTUNE_TOLERANCE
+from compressor import compress
+from container import ContainerReader
+from genome import estimate_memory
+from sequence import open_sequence, sequence_bytes
+import json, os, sys, tempfile, time
+
+
+#(start, end) of count windows of size bases spread evenly over length bases, one window of all of it when it is that short
+def sample_windows(length, count, size):
+    if length <= count * size:
+        return [(0, length)]
+    step = (length - size) // max(count - 1, 1)
+    return [(k * step, k * step + size) for k in range(count)]
+
+
+#compresses every sample with one setting and extrapolates the whole input's time, memory and ratio from them.
+#Index build time is counted once, the parse time grows with the number of bases
+def measure(samples, length, height, level, index_mode, window):
+    tree_times, parse_time, bases, stream_bytes = [], 0.0, 0, 0
+    for path in samples:
+        metrics = compress(path, path + ".bin", height=height, level=level, index_mode=index_mode, window=window,
+                           block_size=None, workers=1, precompute=None, cache_dir=None, reference=None, stats=False,
+                           checkpoint=None)
+        tree_times.append(metrics["tree_creation_time"])
+        parse_time += metrics["compressor_time"]
+        bases += os.path.getsize(path)
+        with open(path + ".bin", "rb") as file:
+            stream_bytes += ContainerReader(file.read()).blocks[0][1]
+    return {
+        "height": height,
+        "level": level,
+        "estimated_compression_time": round(max(tree_times) + parse_time * length / max(bases, 1), 3),
+        "estimated_memory": estimate_memory(length, height, index_mode, window),
+        "estimated_ratio": round(stream_bytes / max(bases, 1), 4),
+    }
+
+
+#fastest candidate that fits in memory with a ratio within tolerance of the best one that fits. When none fits the
+#one needing the least memory is taken, the run could not be made smaller otherwise
+def choose(candidates, memory, tolerance):
+    fits = [candidate for candidate in candidates if memory is None or candidate["estimated_memory"] <= memory]
+    if not fits:
+        return min(candidates, key=lambda candidate: (candidate["estimated_memory"], candidate["estimated_compression_time"]))
+    best_ratio = min(candidate["estimated_ratio"] for candidate in fits)
+    return min((candidate for candidate in fits if candidate["estimated_ratio"] <= best_ratio * (1 + tolerance)),
+               key=lambda candidate: candidate["estimated_compression_time"])
+
+
+def autotune(src, heights=AUTOTUNE_HEIGHTS, levels=None, index_mode=INDEX_MODE, window=WINDOW, samples=AUTOTUNE_SAMPLES,
+             sample_size=AUTOTUNE_SAMPLE_SIZE, memory=AUTOTUNE_MEMORY, tolerance=AUTOTUNE_TOLERANCE):
+    """
+    Chooses HEIGHT and level for a cleaned DNA file from a few sampled windows of it.
+
+    Every window is written out and compressed on its own under each candidate setting, one after the other
+    so the timings don't compete for cores. The whole input's compression time is extrapolated from them, its
+    memory is genome.estimate_memory for the whole length and its ratio is the ratio of the samples' streams.
+    The setting chosen is the fastest one that fits in memory whose ratio is within tolerance of the best.
+    Samples are compressed as single streams without a reference, whatever the real run uses.
+
+    Args:
+        src (str): Path to the cleaned .txt of A, C, G and T.
+        heights (list, optional): HEIGHTs to try. Defaults to config.AUTOTUNE_HEIGHTS.
+        levels (list, optional): Level names from config.LEVELS to try, None for all of them. Defaults to None.
+        index_mode (str, optional): "kmer", "tree" or "suffix". Defaults to config.INDEX_MODE.
+        window (int, optional): Positions of history factors may reach back, None for all. Defaults to config.WINDOW.
+        samples (int, optional): Windows sampled evenly across the input. Defaults to config.AUTOTUNE_SAMPLES.
+        sample_size (int, optional): Bases per window. Defaults to config.AUTOTUNE_SAMPLE_SIZE.
+        memory (int, optional): Bytes the whole run may need, None for no limit. Defaults to config.AUTOTUNE_MEMORY.
+        tolerance (float, optional): Fraction the chosen ratio may be above the best. Defaults to config.AUTOTUNE_TOLERANCE.
+
+    Returns:
+        dict: height and level chosen, with their estimated_compression_time, estimated_memory and estimated_ratio,
+            autotune_time, and the estimates of every setting tried as candidates.
+    """
+    start_time = time.time()
+    content = sequence_bytes(open_sequence(src))
+    with tempfile.TemporaryDirectory() as temporary:
+        paths = []
+        for k, (start, end) in enumerate(sample_windows(len(content), samples, sample_size)):
+            paths.append(os.path.join(temporary, "sample" + str(k) + ".txt"))
+            with open(paths[-1], "wb") as file:
+                file.write(content[start:end])
+        candidates = [measure(paths, len(content), height, level, index_mode, window)
+                      for height in heights for level in (levels or LEVELS)]
+    tuned = dict(choose(candidates, memory, tolerance))
+    tuned["autotune_time"] = round(time.time() - start_time, 3)
+    tuned["candidates"] = candidates
+    return tuned
+
+
+#usage: python autotune.py [FILE], tunes the default chromosome when no FILE is given
+def main():
+    print(json.dumps(autotune(sys.argv[1] if len(sys.argv) > 1 else DNA_FILE_PATH + DNA_FILE_TXT), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,23 @@
-from pathlib import Path
-import time, json, subprocess, sys, csv, os
-sys.path.append(str(Path(__file__).resolve().parent.parent))
-from dnazip.code.bitfile import export_as_binary
-from config import DNA_FILE_PATH, DNA_FILE, HEIGHT, DNA_FILE_TXT
-
-bin_file_path = DNA_FILE_PATH + DNA_FILE + "_" + str(HEIGHT) + ".bin"
-original_file_path = DNA_FILE_PATH+DNA_FILE_TXT
-open(bin_file_path, "w").close()
+import time, csv, os, sys, tempfile
+from config import DNA_FILE_PATH, DNA_FILE, HEIGHT, INDEX_MODE, LEVEL, WINDOW, BLOCK_SIZE, BLOCK_DICTIONARY, WORKERS, PRECOMPUTE, INDEX_CACHE, REFERENCE_FILE, AUTOTUNE
+from concurrent.futures import ProcessPoolExecutor
+import compressor
+from compressor import compress
+from decompressor import decompress
+from autotune import autotune
 
 FIELD_NAMES = [
     "genome",
     "tree_height",
+    "index_mode",
+    "level",
+    "block_size",
+    "workers",
+    "precompute",
+    "reference",
     "tree_memory",
+    "index_cache_hits",
+    "index_cache_misses",
     "total_compression_time",
     "tree_creation_time",
     "compressor_time",
@@ -19,6 +25,23 @@ FIELD_NAMES = [
     "space_savings",
     "original_file_size",
     "encoded_file_size",
+    # auto-tuner estimates for the chosen tree_height and level, empty unless AUTOTUNE is set
+    "autotune_time",
+    "estimated_compression_time",
+    "estimated_memory",
+    "estimated_ratio",
+    # encoder stats, empty unless STATS is set
+    "find_factor_time",
+    "extended_search_time",
+    "encode_factor_time",
+    "write_buffer_time",
+    "positions_searched",
+    "candidates_per_position",
+    "factor_lengths",
+    "hit_kinds",
+    "position_codes",
+    "literal_runs",
+    "candidates",
 ]
 
 def file_size(file_path):
@@ -33,8 +56,24 @@ def compression_ratio(orig_file_path, enc_file_path):
 
     return round(enc_file_size / orig_file_size, 4), orig_file_size, enc_file_size
 
+#moves a csv written with other columns out of the way to the first free <name>.<n>.csv, so rows are never
+#appended under a header they don't match
+def rotate_csv(csv_filepath):
+    if not os.path.isfile(csv_filepath):
+        return
+    with open(csv_filepath, newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f), None)
+    if header == FIELD_NAMES:
+        return
+    root, extension = os.path.splitext(csv_filepath)
+    k = 1
+    while os.path.exists(root + "." + str(k) + extension):
+        k += 1
+    os.replace(csv_filepath, root + "." + str(k) + extension)
+
 def print_metrics(data):
     csv_filepath = "./data.csv"
+    rotate_csv(csv_filepath)
     file_exists = os.path.isfile(csv_filepath)
     with open(csv_filepath, "a", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=FIELD_NAMES)
@@ -47,48 +86,100 @@ def print_metrics(data):
         writer.writerow(data)
     return 0
 
-def calculate_metrics(data):
+def calculate_metrics(data, original_file_path, bin_file_path, genome, height, index_mode, level, block_size, workers, precompute, reference):
     compression_ratio_val, original_file_size, encoded_file_size = compression_ratio(original_file_path,bin_file_path)
     space_saving = 1 - compression_ratio_val
-    height = HEIGHT
-    genome = DNA_FILE
 
     data.update({
         "compression_ratio": compression_ratio_val,
         "space_savings": space_saving,
         "tree_height": height,
+        "index_mode": index_mode,
+        "level": level,
+        "block_size": block_size,
+        "workers": workers,
+        "precompute": precompute,
+        "reference": os.path.basename(reference) if reference else None,
         "genome": genome,
         "original_file_size": original_file_size,
         "encoded_file_size": encoded_file_size
     })
     return data
 
-def main():
+#compresses and decompresses one genome in this process and appends its metrics to data.csv. With tune,
+#height and level are chosen by autotune.autotune first and its estimates go in the metrics too
+def run_pipeline(genome=DNA_FILE, path=DNA_FILE_PATH, height=HEIGHT, level=LEVEL, index_mode=INDEX_MODE,
+                 window=WINDOW, block_size=BLOCK_SIZE, block_dictionary=BLOCK_DICTIONARY, workers=WORKERS, precompute=PRECOMPUTE,
+                 cache_dir=INDEX_CACHE, reference=REFERENCE_FILE, stats=None, record=True, tune=AUTOTUNE):
+    original_file_path = path + genome + ".txt"
     print("=== Starting pipeline ===")
-
-    print("Step 1: Running compress.py")
+    tuned = {}
+    if tune:
+        print("Step 0: Auto-tuning")
+        tuned = autotune(original_file_path, index_mode=index_mode, window=window)
+        height, level = tuned.pop("height"), tuned.pop("level")
+        del tuned["candidates"]
+        print(f"Chose HEIGHT {height} and level {level} in {tuned['autotune_time']:.2f} seconds")
+    bin_file_path = path + genome + "_" + str(height) + ".bin"
+
+    print("Step 1: Compressing")
     start=time.time()
-    result = subprocess.run(["python3", "compressor.py"], check=True, text=True, stdout=subprocess.PIPE, stderr=None)  
-    compression_metrics = json.loads(result.stdout)
+    compression_metrics = compress(original_file_path, bin_file_path, height=height, level=level, index_mode=index_mode,
+                                   window=window, block_size=block_size, block_dictionary=block_dictionary, workers=workers,
+                                   precompute=precompute, cache_dir=cache_dir, reference=reference, stats=stats)
     end=time.time()
     print(f"Total Compression Time: {end - start:.2f} seconds")
+    compression_metrics.update(tuned)
 
-    with open(DNA_FILE_PATH+DNA_FILE + "_" + str(HEIGHT) + "_encoded.txt", "r") as file:
-        text_file = file.read()
-    export_as_binary(DNA_FILE_PATH + DNA_FILE  + "_" + str(HEIGHT) + ".bin", text_file)
-
-    print("Step 2: Running decompress.py")
+    print("Step 2: Decompressing")
     start=time.time()
-    subprocess.run(["python3", "decompressor.py"], check=True)
+    decompress(bin_file_path, path + genome + "_" + str(height) + "_decoded.txt", workers, reference)
     end=time.time()
     print(f"Total Decompression Time: {end - start:.2f} seconds")
 
     print("=== Pipeline complete ===")
 
-    all_metrics = calculate_metrics(compression_metrics)
-    print_metrics(all_metrics)
+    all_metrics = calculate_metrics(compression_metrics, original_file_path, bin_file_path, genome, height, index_mode, level, block_size, workers, precompute, reference)
+    if record:
+        print_metrics(all_metrics)
+    return all_metrics
+
+#runs the pipeline for one height of a sweep in a worker, returns its metrics without recording them
+def sweep_height(job):
+    height, genome, path, settings = job
+    return run_pipeline(genome, path, height, *settings, record=False, tune=False)
+
+#runs the pipeline once per height in a process pool and appends one data.csv row per height, in the order given.
+#Every worker maps the same input, so its pages are read once. The kmer and tree indexes only hold the positions
+#their own parse visits, so they are built per height, but the suffix engine does not depend on the height and is
+#built once into cache_dir (a temporary one when none is set) for every height to map
+def run_sweep(heights, genome=DNA_FILE, path=DNA_FILE_PATH, level=LEVEL, index_mode=INDEX_MODE,
+              window=WINDOW, block_size=BLOCK_SIZE, block_dictionary=BLOCK_DICTIONARY, workers=WORKERS, precompute=PRECOMPUTE,
+              cache_dir=INDEX_CACHE, reference=REFERENCE_FILE, stats=None, sweep_workers=None):
+    with tempfile.TemporaryDirectory() as temporary:
+        cache_dir = cache_dir or temporary
+        if index_mode == "suffix" or precompute:
+            compressor.configure(max(heights), level, "suffix", window, cache_dir)
+            compressor.open_input(path + genome + ".txt", reference)
+            compressor.suffix_index(compressor.primed_input())
+            compressor.release()
+        settings = (level, index_mode, window, block_size, block_dictionary, workers, precompute, cache_dir, reference, stats)
+        jobs = [(height, genome, path, settings) for height in heights]
+        with ProcessPoolExecutor(max_workers=sweep_workers or min(len(jobs), os.cpu_count() or 1)) as pool:
+            rows = list(pool.map(sweep_height, jobs))
+    for row in rows:
+        print_metrics(row)
+    return rows
+
+#usage: python biocompress.py [HEIGHT ...], several heights run a sweep
+def main():
+    heights = [int(height) for height in sys.argv[1:]]
+    if heights:
+        run_sweep(heights)
+    else:
+        run_pipeline()
 
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,226 @@
+from codec import FIBONACCI
+
+
+class BitWriter:
+    """
+    Buffered writer that packs bits MSB first into bytes and writes them out in fixed-size chunks.
+
+    The stream ends with a single 1 bit followed by zero padding up to the next byte,
+    so readers can find where the data stops without storing its length.
+
+    Args:
+        file: Binary file object to write to.
+        chunk_size (int, optional): Bytes collected before each write. Defaults to 64 KiB.
+        text_file: Optional text file that also receives every bit as '0'/'1', for debugging.
+    """
+
+    def __init__(self, file, chunk_size=1 << 16, text_file=None):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.text_file = text_file
+        self.buffer = bytearray()
+        self.accumulator = 0
+        self.count = 0
+        self.bits_written = 0
+
+
+    def write_bits(self, value, width):
+        """
+        Appends the lowest width bits of value.
+        """
+        if self.text_file and width:
+            self.text_file.write(format(value, "0" + str(width) + "b"))
+        self.accumulator = (self.accumulator << width) | value
+        self.count += width
+        self.bits_written += width
+        if self.count >= 64:
+            self._drain()
+
+
+    def write(self, bits):
+        """
+        Appends a string of '0'/'1' characters.
+        """
+        if not bits:
+            return
+        self.write_bits(int(bits, 2), len(bits))
+
+
+    def _drain(self):
+        # moves every complete byte from the accumulator to the buffer
+        whole, rest = divmod(self.count, 8)
+        if whole:
+            self.buffer += (self.accumulator >> rest).to_bytes(whole, "big")
+            self.accumulator &= (1 << rest) - 1
+            self.count = rest
+        if len(self.buffer) >= self.chunk_size:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+
+
+    def state(self):
+        """
+        Writes out the buffered bytes and returns the bits not yet written, so a stream can be continued
+        later by a new writer at the same file offset.
+
+        Returns:
+            tuple: (accumulator, count, bits_written) for restore.
+        """
+        self.file.write(self.buffer)
+        self.buffer.clear()
+        return self.accumulator, self.count, self.bits_written
+
+
+    def restore(self, state):
+        """
+        Continues the stream a writer returned state for.
+        """
+        self.accumulator, self.count, self.bits_written = state
+
+
+    def finish(self):
+        """
+        Writes the stop bit and padding and flushes everything, leaving the files open.
+        """
+        self.accumulator = (self.accumulator << 1) | 1
+        self.count += 1
+        padding = -self.count % 8
+        self.accumulator <<= padding
+        self.count += padding
+        self._drain()
+        self.file.write(self.buffer)
+        self.buffer.clear()
+
+
+    def close(self):
+        """
+        Finishes the stream and closes the files.
+        """
+        self.finish()
+        self.file.close()
+        if self.text_file:
+            self.text_file.close()
+
+
+def read_bit_string(file_path):
+    """
+    Reads a stream written by BitWriter back as a string of '0'/'1' characters.
+
+    Args:
+        file_path (str): Path to the packed file.
+
+    Returns:
+        str: The bits that were written, without the stop bit and padding.
+    """
+    with open(file_path, "rb") as file:
+        data = file.read()
+    if not data:
+        return ""
+    bits = bin(int.from_bytes(data, "big"))[2:].zfill(len(data) * 8)
+    return bits[:bits.rindex("1")]
+
+
+# FIBONACCI_BYTE[j][b] is the value of byte b when it holds bits 8j..8j+7 of a Fibonacci code
+FIBONACCI_BYTE = [
+    [sum(FIBONACCI[8 * j + r] for r in range(8) if b >> (7 - r) & 1) for b in range(256)]
+    for j in range(len(FIBONACCI) // 8)
+]
+
+# BYTE_BASES[b] is the four bases packed in byte b, 2 bits each
+PAIR_BASES = b"GTCA"
+BYTE_BASES = [bytes(PAIR_BASES[b >> shift & 3] for shift in (6, 4, 2, 0)) for b in range(256)]
+
+
+class BitReader:
+    """
+    Random-access reader over a stream written by BitWriter.
+
+    The data is a bytes-like object, usually an mmap of the .bin, so only the bytes
+    around each read are touched. Codes are decoded with integer operations on
+    windows of the stream instead of '0'/'1' strings.
+
+    Args:
+        data: bytes, memoryview or mmap holding the packed stream.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.length = 0
+        if len(data):
+            last = data[len(data) - 1]
+            self.length = (len(data) - 1) * 8 + 7 - ((last & -last).bit_length() - 1)
+
+
+    def peek(self, position, width):
+        """
+        Returns width bits starting at bit position as an int, with bits past the end read as 0.
+        """
+        if width <= 0:
+            return 0
+        end = min(position + width, self.length)
+        if end <= position:
+            return 0
+        start_byte = position >> 3
+        end_byte = (end + 7) >> 3
+        value = int.from_bytes(self.data[start_byte:end_byte], "big")
+        value >>= end_byte * 8 - end
+        value &= (1 << (end - position)) - 1
+        return value << (position + width - end)
+
+
+    def fibonacci_value(self, position, width):
+        """
+        Returns the value of width Fibonacci code bits, using one table lookup per byte.
+        """
+        padding = -width % 8
+        chunk = (self.peek(position, width) << padding).to_bytes((width + padding) // 8, "big")
+        return sum(FIBONACCI_BYTE[j][b] for j, b in enumerate(chunk) if b)
+
+
+    def read_fibonacci(self, position):
+        """
+        Decodes the Fibonacci code starting at position, which ends with the first 11.
+
+        Returns:
+            tuple: (value, number of bits used).
+        """
+        start = position
+        while position < self.length:
+            # windows overlap by one bit so an 11 across their boundary is still seen
+            window = self.peek(position, 64)
+            pairs = window & (window << 1) & ((1 << 64) - 1)
+            if pairs:
+                end = position + 64 - pairs.bit_length() + 2
+                return self.fibonacci_value(start, end - start - 1), end - start
+            position += 63
+        raise ValueError("Fibonacci code at bit " + str(start) + " is not terminated")
+
+
+    def read_position(self, position, width):
+        """
+        Decodes a factor position: width bits of binary with a 1 added after its first 11,
+        or a Fibonacci code followed by a 0.
+
+        Returns:
+            tuple: (value, number of bits used).
+        """
+        window = self.peek(position, width)
+        pairs = window & (window << 1) & ((1 << width) - 1)
+        if not pairs:
+            return window, width
+        index = width - pairs.bit_length()
+        if not self.peek(position + index + 2, 1):
+            return self.fibonacci_value(position, index + 1), index + 3
+        window = self.peek(position, width + 1)
+        tail = width - index - 2
+        return (window >> (tail + 1)) << tail | window & ((1 << tail) - 1), width + 1
+
+
+    def read_bases(self, position, num):
+        """
+        Decodes num bases of 2 bits each starting at position, as ASCII bytes.
+        """
+        width = 2 * num
+        padding = -width % 8
+        chunk = (self.peek(position, width) << padding).to_bytes((width + padding) // 8, "big")
+        return b"".join(BYTE_BASES[b] for b in chunk)[:num]
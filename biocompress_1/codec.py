@@ -0,0 +1,216 @@
+from bisect import bisect_right
+import numpy as np
+
+
+FIBONACCI = [1, 2]
+while len(FIBONACCI) < 96:
+    FIBONACCI.append(FIBONACCI[-1] + FIBONACCI[-2])
+# the Fibonacci numbers that fit in an int64, for the batch codes
+FIBONACCI_ARRAY = np.array([f for f in FIBONACCI if f < 1 << 63], dtype=np.int64)
+
+# codes of the values below SMALL_CODES are looked up instead of computed, that covers most lengths and runs
+SMALL_CODES = 1 << 12
+
+# 2 bit code of every base, anything else is coded like A as base_to_binary does
+BASE_BITS = {"A": 3, "C": 2, "T": 1, "G": 0}
+BASE_DIGITS = str.maketrans("ACTG", "3210")
+
+
+#Fibonacci code of num as (value, width): bit j from the top is set when the j-th Fibonacci number is in its
+#Zeckendorf sum, and the lowest bit is the closing 1
+def _fibonacci_code(num):
+    if not num:
+        return 1, 2
+    top = bisect_right(FIBONACCI, num) - 1
+    width = top + 2
+    value = 1
+    j = top
+    while num:
+        if FIBONACCI[j] <= num:
+            num -= FIBONACCI[j]
+            value |= 1 << (width - 1 - j)
+            j -= 2 #the next one can't be used too, no two consecutive Fibonacci numbers are
+        else:
+            j -= 1
+    return value, width
+
+
+FIBONACCI_CODES = [_fibonacci_code(num) for num in range(SMALL_CODES)]
+
+
+#Fibonacci code of num as (value, width), the same bits as converter.encode_fibonacci
+def fibonacci_code(num):
+    if num < SMALL_CODES:
+        return FIBONACCI_CODES[num]
+    return _fibonacci_code(num)
+
+
+#decodes a Fibonacci code given as (value, width) back to the number
+def fibonacci_value(value, width):
+    num = 0
+    for j in range(width - 1):
+        if value >> (width - 1 - j) & 1:
+            num += FIBONACCI[j]
+    return num
+
+
+#binary code of num at input position i as (value, width): position_width(i) bits with a 1 added after the
+#first 11, the same bits as converter.encode_binary
+def binary_code(num, i):
+    width = max((i + 1).bit_length(), num.bit_length())
+    pairs = num & (num >> 1)
+    if not pairs:
+        return num, width
+    shift = pairs.bit_length() - 1 #bits shift + 1 and shift are the first 11
+    return (num >> shift) << (shift + 1) | 1 << shift | num & ((1 << shift) - 1), width + 1
+
+
+#decodes the value of a binary code, dropping the 1 added after the first 11. Leading zeros don't change it, so no width is needed
+def binary_value(value):
+    triples = value & (value >> 1) & (value >> 2)
+    if not triples:
+        return value
+    shift = triples.bit_length() + 1 #the first 1 of the first 111
+    return (value >> (shift + 1)) << shift | value & ((1 << shift) - 1)
+
+
+#shorter of the binary code and the Fibonacci code followed by a 0 of a factor position, binary only when strictly shorter
+def position_code(position, i):
+    fibonacci, fibonacci_width = fibonacci_code(position)
+    value, width = binary_code(position, i)
+    if width < fibonacci_width + 1:
+        return value, width
+    return fibonacci << 1, fibonacci_width + 1
+
+
+#2 bit codes of a string of bases as (value, width)
+def bases_code(bases):
+    if len(bases) == 1:
+        return BASE_BITS.get(bases, 3), 2
+    return int(bases.translate(BASE_DIGITS), 4), 2 * len(bases)
+
+
+#converts factor ([position], length, kind) at input position i into a token ((value, width), kind, length) with the
+#same bits as converter.encode_factor, or into a base token when the bases are cheaper
+def encode_factor(factor, i, content):
+    length, kind = factor[1], factor[2]
+    length_value, length_width = fibonacci_code(length)
+    position_value, position_width = position_code(factor[0][0] + 1, i)
+    width = length_width + 1 + position_width
+    if length * 2 <= width:
+        return bases_code(content[i:i+length]), "base", length #the factor or palindrome copy is exactly what follows i
+    return ((length_value << 1 | (kind != "factor")) << position_width | position_value, width), kind, length
+
+
+#bit length of every element of a non-negative int64 array, exact below 2 ** 53
+def _bit_lengths(values):
+    return np.frexp(values.astype(np.float64))[1].astype(np.int64)
+
+
+def fibonacci_codes(values):
+    """
+    Fibonacci codes of an array of numbers at once, one NumPy pass per Fibonacci number.
+
+    Args:
+        values: Array-like of non-negative ints whose codes fit in 64 bits.
+
+    Returns:
+        tuple: (codes, widths) as uint64 and int64 arrays, element k matching fibonacci_code(values[k]).
+    """
+    remaining = np.array(values, dtype=np.int64)
+    codes = np.ones(len(remaining), dtype=np.uint64)
+    top = np.searchsorted(FIBONACCI_ARRAY, remaining, side="right") - 1
+    widths = np.where(remaining > 0, top + 2, 2)
+    for j in range(int(top.max(initial=-1)), -1, -1):
+        #greedy takes a number whenever it fits, the remainder is then too small for the one below
+        used = remaining >= FIBONACCI_ARRAY[j]
+        remaining[used] -= FIBONACCI_ARRAY[j]
+        codes[used] |= np.left_shift(np.uint64(1), (widths[used] - 1 - j).astype(np.uint64))
+    return codes, widths
+
+
+def fibonacci_values(codes, widths):
+    """
+    Decodes an array of Fibonacci codes at once.
+
+    Args:
+        codes: uint64 array of codes, as fibonacci_codes returns them.
+        widths: int array of their widths.
+
+    Returns:
+        np.ndarray: int64 array of the numbers.
+    """
+    codes = np.asarray(codes, dtype=np.uint64)
+    widths = np.asarray(widths, dtype=np.int64)
+    values = np.zeros(len(codes), dtype=np.int64)
+    for j in range(int(widths.max(initial=1)) - 1):
+        inside = j < widths - 1
+        shift = np.where(inside, widths - 1 - j, 0).astype(np.uint64)
+        bit = (codes >> shift) & np.uint64(1)
+        values += np.where(inside & (bit == 1), FIBONACCI_ARRAY[j], 0)
+    return values
+
+
+def binary_codes(values, starts):
+    """
+    Binary codes of an array of positions at once.
+
+    Args:
+        values: Array-like of non-negative ints below 2 ** 53.
+        starts: Array-like of the input positions they are coded at.
+
+    Returns:
+        tuple: (codes, widths) as int64 arrays, element k matching binary_code(values[k], starts[k]).
+    """
+    values = np.array(values, dtype=np.int64)
+    widths = np.maximum(_bit_lengths(np.asarray(starts, dtype=np.int64) + 1), _bit_lengths(values))
+    pairs = values & (values >> 1)
+    shift = np.maximum(_bit_lengths(pairs) - 1, 0)
+    escaped = (values >> shift) << (shift + 1) | (1 << shift) | values & ((1 << shift) - 1)
+    return np.where(pairs > 0, escaped, values), widths + (pairs > 0)
+
+
+def binary_values(codes):
+    """
+    Decodes an array of binary codes at once.
+
+    Args:
+        codes: int64 array of codes, as binary_codes returns them.
+
+    Returns:
+        np.ndarray: int64 array of the numbers.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    triples = codes & (codes >> 1) & (codes >> 2)
+    shift = _bit_lengths(triples) + 1
+    removed = (codes >> (shift + 1)) << shift | codes & ((1 << shift) - 1)
+    return np.where(triples > 0, removed, codes)
+
+
+def encode_factors(positions, lengths, kinds, starts):
+    """
+    Encodes many factors at once, with the same bits encode_factor gives each of them.
+
+    Args:
+        positions: Array-like of factor positions, before the +1 of the code.
+        lengths: Array-like of factor lengths.
+        kinds: Array-like of bools, True for palindromes.
+        starts: Array-like of the input positions the factors are coded at.
+
+    Returns:
+        tuple: (codes, widths, bases). codes is a list of Python ints, since whole factor codes can be
+        longer than 64 bits, widths an int64 array, and bases a bool array of the factors cheaper as bases.
+    """
+    positions = np.asarray(positions, dtype=np.int64) + 1
+    lengths = np.asarray(lengths, dtype=np.int64)
+    kinds = np.asarray(kinds, dtype=bool)
+    length_codes, length_widths = fibonacci_codes(lengths)
+    binary, binary_widths = binary_codes(positions, starts)
+    fibonacci, fibonacci_widths = fibonacci_codes(positions)
+    use_binary = binary_widths < fibonacci_widths + 1
+    position_widths = np.where(use_binary, binary_widths, fibonacci_widths + 1)
+    widths = length_widths + 1 + position_widths
+    codes = [(int(length) << 1 | int(kind)) << int(width) | (int(short) if used else int(long) << 1)
+             for length, kind, width, short, long, used
+             in zip(length_codes, kinds, position_widths, binary, fibonacci, use_binary)]
+    return codes, widths, lengths * 2 <= widths
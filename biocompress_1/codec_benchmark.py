@@ -0,0 +1,57 @@
+from config import DNA_FILE_PATH, DNA_FILE_TXT, HEIGHT
+from bitstream import BitWriter
+from sequence import open_sequence
+import codec, converter
+import io, json, random, time
+
+
+#the string codes encode_factor used to build, written the way write_buffer used to write them
+def strings(factors, content):
+    writer = BitWriter(io.BytesIO())
+    for factor, i in factors:
+        writer.write(converter.encode_factor(factor, i, content)[0])
+
+
+def integers(factors, content):
+    writer = BitWriter(io.BytesIO())
+    for factor, i in factors:
+        writer.write_bits(*codec.encode_factor(factor, i, content)[0])
+
+
+def batch(factors, content):
+    writer = BitWriter(io.BytesIO())
+    codes, widths, bases = codec.encode_factors([factor[0][0] for factor, _ in factors], [factor[1] for factor, _ in factors],
+                                                [factor[2] == "palindrome" for factor, _ in factors], [i for _, i in factors])
+    for (factor, i), code, width, cheaper in zip(factors, codes, widths, bases):
+        if cheaper:
+            writer.write_bits(*codec.bases_code(content[i:i+factor[1]]))
+        else:
+            writer.write_bits(code, int(width))
+
+
+#encodes and writes random factors over the input and prints the best of repeats runs per factor in microseconds.
+#Lengths are drawn like the parse finds them, mostly just above HEIGHT with a long tail
+def main(count=200000, repeats=5):
+    content = open_sequence(DNA_FILE_PATH + DNA_FILE_TXT)
+    generator = random.Random(0)
+    factors = []
+    for _ in range(count):
+        length = HEIGHT + int(generator.expovariate(1 / 64))
+        i = generator.randrange(1, len(content) - length)
+        factors.append((([generator.randrange(i)], length, generator.choice(("factor", "palindrome"))), i))
+    results = {}
+    for name, encode in (("strings", strings), ("integers", integers), ("batch", batch)):
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            encode(factors, content)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name + "_us"] = round(best / count * 1e6, 3)
+    results["speedup"] = round(results["strings_us"] / results["integers_us"], 2)
+    results["batch_speedup"] = round(results["strings_us"] / results["batch_us"], 2)
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
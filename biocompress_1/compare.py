@@ -1,25 +1,67 @@
 from config import DNA_FILE, DNA_FILE_PATH, COMPARE_LENGTH, HEIGHT
-import sys
+import numpy as np
+import mmap, os, sys
+
+
+CHUNK_SIZE = 1 << 24
+
+
+#maps a whole file read-only, an empty file can't be mapped so it gives empty bytes
+def map_file(file):
+    if not os.fstat(file.fileno()).st_size:
+        return b""
+    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def first_mismatch(original_path, decoded_path, chunk_size=CHUNK_SIZE):
+    """
+    Finds the first byte where two files differ, comparing memory maps of them a chunk at a time.
+
+    Equal chunks take a single bytes comparison, only the first chunk that differs is compared
+    byte by byte with NumPy, so neither file is ever read whole.
+
+    Args:
+        original_path (str): Path to the original sequence.
+        decoded_path (str): Path to the decoded sequence.
+        chunk_size (int, optional): Bytes compared at a time. Defaults to 16 MiB.
+
+    Returns:
+        int: Offset of the first differing byte, the length of the shorter file when one is a prefix
+        of the other, or None when the files are identical.
+    """
+    with open(original_path, "rb") as original_file, open(decoded_path, "rb") as decoded_file:
+        original, decoded = map_file(original_file), map_file(decoded_file)
+        length = min(len(original), len(decoded))
+        for start in range(0, length, chunk_size):
+            end = min(start + chunk_size, length)
+            if original[start:end] != decoded[start:end]:
+                differ = np.frombuffer(original[start:end], dtype=np.uint8) != np.frombuffer(decoded[start:end], dtype=np.uint8)
+                return start + int(differ.argmax())
+        return None if len(original) == len(decoded) else length
+
+
+#prints COMPARE_LENGTH bases of path from position
+def print_bases(path, position):
+    with open(path, "rb") as file:
+        file.seek(position)
+        print(file.read(COMPARE_LENGTH).decode("ascii", "replace"))
 
-with open(DNA_FILE_PATH+DNA_FILE + ".txt", "r") as file:
-    original = file.read()
-with open(DNA_FILE_PATH+DNA_FILE + "_" + str(HEIGHT) + "_decoded.txt", "r") as file:
-    decoded = file.read()
 
 def main():
-    print(DNA_FILE_PATH+DNA_FILE + ".txt")
-    print(DNA_FILE_PATH+DNA_FILE + "_" + str(HEIGHT) + "_decoded.txt")
-    for i in range(len(original)):
-        if decoded[i]!=original[i]:
-            print("NOT MATCHING")
-            print("Location:", i)
-            print("Error:")
-            print(original[i:i+COMPARE_LENGTH])
-            print(decoded[i:i+COMPARE_LENGTH])
-            sys.exit()
+    original_path = DNA_FILE_PATH + DNA_FILE + ".txt"
+    decoded_path = DNA_FILE_PATH + DNA_FILE + "_" + str(HEIGHT) + "_decoded.txt"
+    print(original_path)
+    print(decoded_path)
+    position = first_mismatch(original_path, decoded_path)
+    if position is not None:
+        print("NOT MATCHING")
+        print("Location:", position)
+        print("Error:")
+        print_bases(original_path, position)
+        print_bases(decoded_path, position)
+        sys.exit()
     print("MATCHING")
-            
-        
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
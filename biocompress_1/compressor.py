@@ -1,16 +1,126 @@
-from AGCT_tree import create_tree, find_factor
-from config import HEIGHT, DNA_FILE, CONTENT,DNA_FILE_PATH, COMPLEMENT_TABLE
-from converter import base_to_binary, encode_factor, encode_fibonacci
-from typing import Optional
+from AGCT_tree import create_tree
+from kmer_index import KmerIndex
+from suffix_index import SuffixIndex
+from match_kernel import MatchKernel
+from bitstream import BitWriter
+from container import ContainerWriter, MAGIC, checksum
+from sequence import Sequence, open_sequence, sequence_bytes, join_sequences
+from index_cache import IndexCache
+from encoder_stats import EncoderStats
+from config import HEIGHT, DNA_FILE, DNA_FILE_TXT, DNA_FILE_PATH, INDEX_MODE, LEVEL, LEVELS, WINDOW, ENCODED_TEXT, BLOCK_SIZE, BLOCK_DICTIONARY, WORKERS, PRECOMPUTE, INDEX_CACHE, INDEX_CACHE_SIZE, REFERENCE_FILE, CHECKPOINT
+from codec import bases_code, encode_factor, fibonacci_code
+from concurrent.futures import ProcessPoolExecutor
+from array import array
 from tqdm import tqdm
-import json, sys, time, psutil, os
+import numpy as np
+import io, json, pickle, sys, time, psutil, os
+import config
 
 
-open(DNA_FILE_PATH + DNA_FILE + "_" + str(HEIGHT) + "_encoded.txt", "w").close()
-output_file = open(DNA_FILE_PATH + DNA_FILE + "_" + str(HEIGHT) + "_encoded.txt", "a", encoding="utf-8")
-start_time = time.time()
-TREE = create_tree(HEIGHT)
-tree_created_time=time.time()
+#the cleaned input and the reference it is primed with, mapped by open_input in the main process and in every worker
+SEQUENCE = None
+REFERENCE = Sequence(b"")
+
+#state of the stream being compressed, set up by prepare
+CONTENT = None
+TREE = None
+KERNEL = None
+output_file = None
+CACHE = None
+#EncoderStats of the stream being compressed when stats are asked for, None otherwise
+ENCODER_STATS = None
+
+MAX_CHAIN = LEVELS[LEVEL]["max_chain"]
+NICE_LENGTH = LEVELS[LEVEL]["nice_length"]
+MAX_DISTANCE = LEVELS[LEVEL]["max_distance"]
+
+
+#sets the search parameters every stream is compressed with and opens the index cache, config supplies the defaults.
+#stats=None reads config.STATS when called, so setting it at run time takes effect
+def configure(height=HEIGHT, level=LEVEL, index_mode=INDEX_MODE, window=WINDOW, cache_dir=INDEX_CACHE, stats=None):
+    global HEIGHT, LEVEL, INDEX_MODE, WINDOW, MAX_CHAIN, NICE_LENGTH, MAX_DISTANCE, CACHE, ENCODER_STATS
+    HEIGHT, LEVEL, INDEX_MODE, WINDOW = height, level, index_mode, window
+    MAX_CHAIN = LEVELS[level]["max_chain"]
+    NICE_LENGTH = LEVELS[level]["nice_length"]
+    MAX_DISTANCE = LEVELS[level]["max_distance"]
+    CACHE = IndexCache(cache_dir, INDEX_CACHE_SIZE) if cache_dir else None
+    ENCODER_STATS = EncoderStats() if (config.STATS if stats is None else stats) else None
+
+
+#settings a worker needs to search like this process
+def worker_settings(cache_dir=None):
+    return (HEIGHT, LEVEL, INDEX_MODE, WINDOW, cache_dir, ENCODER_STATS is not None)
+
+
+#starts new stats for the next job of a worker, so each job returns only its own
+def reset_stats():
+    global ENCODER_STATS
+    if ENCODER_STATS:
+        ENCODER_STATS = EncoderStats()
+
+
+#builds the index selected by INDEX_MODE, all of them expose create_positions
+def create_index(height):
+    if WINDOW and INDEX_MODE != "kmer":
+        raise ValueError("WINDOW is only supported by the kmer index")
+    if INDEX_MODE == "tree":
+        return create_tree(height)
+    if INDEX_MODE == "suffix":
+        return suffix_index(CONTENT)
+    return KmerIndex(height, WINDOW)
+
+
+#builds the suffix engine over content, or maps its arrays from CACHE when the same content was indexed before.
+#The kmer and tree indexes only hold the positions the parse inserted, so only the suffix engine is cached
+def suffix_index(content):
+    if CACHE is None:
+        return SuffixIndex(content)
+    key = CACHE.key(sequence_bytes(content), index="suffix")
+    arrays = CACHE.load(key)
+    index = SuffixIndex(content, arrays)
+    if arrays is None:
+        CACHE.store(key, index.arrays)
+    return index
+
+
+#maps the cleaned input and reference instead of reading them, so processes compressing the same files share their pages
+def open_input(file_path=DNA_FILE_PATH + DNA_FILE_TXT, reference_path=None):
+    global SEQUENCE, REFERENCE
+    SEQUENCE = open_sequence(file_path)
+    REFERENCE = open_sequence(reference_path) if reference_path else Sequence(b"")
+
+
+#sets up a block worker with the parent's parameters and its own map of the input
+def start_worker(file_path, settings, reference_path=None):
+    configure(*settings)
+    open_input(file_path, reference_path)
+
+
+#drops the input, index and writer of the last compress and closes its output, so none of them stay alive
+#after it returns. The settings configure set are kept
+def release():
+    global SEQUENCE, REFERENCE, CONTENT, TREE, KERNEL, output_file, CACHE, ENCODER_STATS
+    if output_file is not None:
+        output_file.file.close()
+    SEQUENCE, REFERENCE = None, Sequence(b"")
+    CONTENT = TREE = KERNEL = output_file = CACHE = ENCODER_STATS = None
+
+
+#the text a single stream is compressed over: the reference, then the input. Without a reference the
+#input stays mapped, with one both are joined into a mapped temporary file
+def primed_input():
+    if not REFERENCE:
+        return SEQUENCE
+    return join_sequences(sequence_bytes(REFERENCE), sequence_bytes(SEQUENCE))
+
+
+#builds the index and match kernel over content and sends the output to writer
+def prepare(content, writer):
+    global CONTENT, TREE, KERNEL, output_file
+    CONTENT = content
+    TREE = create_index(HEIGHT)
+    KERNEL = MatchKernel(content)
+    output_file = writer
 
 
 def get_memory_usage():
@@ -19,75 +129,56 @@ def get_memory_usage():
     mem_mb = mem_bytes / (1024 ** 2)
     return round(mem_mb, 2)
 
-tree_memory = get_memory_usage()
-
 #for searching for factors beyond tree, compare input postion and factor postion and count how many bases match
 def extended_search(i, position, kind):
-    i=i+HEIGHT
-    position=position+HEIGHT
-    add_length = 0
-    if i>len(CONTENT)-1:
-        return add_length
-    if kind=="factor":
-        while(CONTENT[i]==CONTENT[position]):
-            add_length+=1
-            i+=1
-            position+=1
-            if i>len(CONTENT)-1:
-                return add_length
-    if kind=="palindrome":
-        while(CONTENT[i].translate(COMPLEMENT_TABLE) == CONTENT[position]):
-            add_length+=1
-            i+=1
-            position+=1
-            if i>len(CONTENT)-1:
-                return add_length
-    return add_length
-
-#finds longest factor or palindrome in the tree
+    if ENCODER_STATS:
+        started = time.perf_counter()
+        length = KERNEL.extend(i + HEIGHT, position + HEIGHT, kind)
+        ENCODER_STATS.add_time("extended_search", started)
+        return length
+    return KERNEL.extend(i + HEIGHT, position + HEIGHT, kind)
+
+#extends every full-height candidate and returns the first longest one with its total length
+def longest_extension(i, positions, kind):
+    best_position, add_length = positions[0], 0
+    for position in positions:
+        add_length_temp = extended_search(i, position, kind)
+        if add_length_temp > add_length:
+            best_position, add_length = position, add_length_temp
+            if NICE_LENGTH and HEIGHT + add_length >= NICE_LENGTH: #good enough, stop searching
+                break
+    return best_position, HEIGHT + add_length
+
+#finds longest factor or palindrome in the tree, looking up both strands in one pass
 def longest_factor_or_palindrome(i):
-    string = CONTENT[i:i+HEIGHT]
-    palindrome = string.translate(COMPLEMENT_TABLE)
-    factor_position = find_factor(string, TREE)
-
-    #if the longest factor is the length of tree, do an extended search and only return longest
-    if factor_position[1]==HEIGHT:
-        add_length = 0
-        position_number = 0
-        position_number_temp = 0
-        if factor_position[0]:
-            for position in factor_position[0]:
-                add_length_temp = extended_search(i, position, "factor")
-                if add_length_temp > add_length: 
-                    add_length = add_length_temp
-                    position_number = position_number_temp
-                position_number_temp +=1 
-            factor_position=([factor_position[0][position_number]], factor_position[1]+add_length)
-
-    #if the longest palindrome is the length of tree, do an extended search and only return longest
-    palindrome_position = find_factor(palindrome, TREE)
-    if palindrome_position[1]==HEIGHT:
-        add_length = 0
-        position_number = 0
-        position_number_temp = 0
-        if palindrome_position[0]:
-            for position in palindrome_position[0]:
-                add_length_temp = extended_search(i, position, "palindrome")
-                if add_length_temp > add_length: 
-                    add_length = add_length_temp
-                    position_number = position_number_temp
-                position_number_temp +=1
-            palindrome_position=([i-palindrome_position[0][position_number]], palindrome_position[1]+add_length) #relative positioning
-    #niche case for short palindromes
-    elif palindrome_position[1]:
-        palindrome_position=([i-palindrome_position[0][0]],palindrome_position[1]) #relative positioning
-    #if both a factor and palindrome were found, compare their lengths and return longest
-    if factor_position[1] and palindrome_position[1]:
-        if factor_position[1] >= palindrome_position[1]:
-            return (factor_position[0], factor_position[1], "factor")
-        else:
-            return (palindrome_position[0], palindrome_position[1], "palindrome")
-    return (None, None, None)
+    if ENCODER_STATS:
+        started = time.perf_counter()
+    if INDEX_MODE == "suffix": #the suffix engine extends its matches itself, so they count as find_factor time
+        match = TREE.longest_match(i)
+        if ENCODER_STATS:
+            ENCODER_STATS.add_time("find_factor", started)
+            ENCODER_STATS.add_search(match, (None, None))
+        return match
+    min_position = max(0, i - MAX_DISTANCE) if MAX_DISTANCE else 0
+    factor, palindrome = TREE.find_both_strands(CONTENT[i:i+HEIGHT], MAX_CHAIN, min_position)
+    if ENCODER_STATS:
+        ENCODER_STATS.add_time("find_factor", started)
+        ENCODER_STATS.add_search(factor, palindrome)
+    #only a position where both a factor and a palindrome were found is encoded as a factor
+    if not (factor[1] and palindrome[1]):
+        return (None, None, None)
+
+    #if the longest factor or palindrome is the length of tree, do an extended search and only keep the longest
+    factor_position, factor_length = factor[0][0], factor[1]
+    if factor_length==HEIGHT:
+        factor_position, factor_length = longest_extension(i, factor[0], "factor")
+    palindrome_position, palindrome_length = palindrome[0][0], palindrome[1]
+    if palindrome_length==HEIGHT:
+        palindrome_position, palindrome_length = longest_extension(i, palindrome[0], "palindrome")
+
+    if factor_length >= palindrome_length:
+        return ([factor_position], factor_length, "factor")
+    return ([i-palindrome_position], palindrome_length, "palindrome") #relative positioning
 
 
 #searches tree for factors, adds current input to tree, returns encoding of longest factor or bases
@@ -96,25 +187,46 @@ def process(i: int):
     longest_factor = longest_factor_or_palindrome(i)
     TREE.create_positions(segment, i)
 
-    #if a longest factor was found, encode it into (binary, kind, length)
+    #if a longest factor was found, encode it into ((value, width), kind, length)
     if longest_factor[0]:
-        longest_factor = encode_factor(longest_factor, i)
-        return longest_factor
+        return timed_encode_factor(longest_factor, i)
     else: 
-        return (base_to_binary(CONTENT[i]), "base", 1)
+        return (bases_code(CONTENT[i]), "base", 1)
+
+
+#encode_factor, timed and counted in ENCODER_STATS when there are stats
+def timed_encode_factor(factor, i):
+    if not ENCODER_STATS:
+        return encode_factor(factor, i, CONTENT)
+    started = time.perf_counter()
+    token = encode_factor(factor, i, CONTENT)
+    ENCODER_STATS.add_time("encode_factor", started)
+    ENCODER_STATS.add_token(token, factor, i)
+    return token
     
 
+#writes the window size + 1 so the decompressor knows how much history it has to keep, 1 means all of it
+def write_header():
+    output_file.write_bits(*fibonacci_code(WINDOW + 1 if WINDOW else 1))
+
+
 #writes length of the block, then writes each factor or base to output file
 def write_buffer(buffer):
+    if ENCODER_STATS:
+        started = time.perf_counter()
     if buffer[0][1]=="base":
         length=0
         for item in buffer:
             length+=item[2]
-        output_file.write(encode_fibonacci(length))
+        output_file.write_bits(*fibonacci_code(length))
+        if ENCODER_STATS:
+            ENCODER_STATS.add_literal_run(length)
     else:
-        output_file.write(encode_fibonacci(len(buffer)))
+        output_file.write_bits(*fibonacci_code(len(buffer)))
     for item in buffer:
-        output_file.write(item[0])
+        output_file.write_bits(*item[0])
+    if ENCODER_STATS:
+        ENCODER_STATS.add_time("write_buffer", started)
 
 
 #adds factors and bases to buffer and manages when to write to output file
@@ -129,27 +241,283 @@ def encode(processed, buffer):
     return buffer
                 
 
-def main():
-    length = len(CONTENT)
-    position = 0
-    buffer=[]
-    with tqdm(total=length, desc="Compressing", unit="bytes", file=sys.stderr, leave=True, disable=not sys.stderr.isatty()) as pbar:
+#compresses CONTENT into output_file, taking each token from search. Bases before start only prime the index,
+#they are known to the decoder. With a checkpoint, checkpoint(position, buffer, journal) is called every interval
+#seconds, and a resumed checkpoint continues from where it was taken instead of starting at start
+def encode_content(start=0, search=process, checkpoint=None, interval=CHECKPOINT, resumed=None):
+    TREE.prime(sequence_bytes(CONTENT), 0, start)
+    if resumed:
+        position, buffer, journal = resumed["position"], resumed["buffer"], resumed["journal"]
+        #the index holds exactly the positions searched so far, so inserting them again in order rebuilds it
+        for searched in journal:
+            TREE.create_positions(CONTENT[searched:searched+HEIGHT], searched)
+    else:
+        position = start
+        buffer=[]
+        journal = array("q")
+        write_header()
+    saved = time.time()
+    with tqdm(total=len(CONTENT)-start, initial=position-start, desc="Compressing", unit="bytes", file=sys.stderr, leave=True, disable=not sys.stderr.isatty()) as pbar:
         while(position<len(CONTENT)):
-            processed = process(position)
+            if checkpoint:
+                journal.append(position)
+            processed = search(position)
+            if not buffer and processed[1]!="base": #the decoder expects a run of bases first
+                processed = (bases_code(CONTENT[position]), "base", 1)
             buffer = encode(processed, buffer)
             position+=processed[2]
             
             pbar.update(processed[2])
-    write_buffer(buffer)
-    output_file.close()
+            if checkpoint and time.time() - saved >= interval:
+                checkpoint(position, buffer, journal)
+                saved = time.time()
+    if buffer:
+        write_buffer(buffer)
+    output_file.finish()
+
+
+#parameters a checkpoint is only valid for: the input files as they were and the settings that change the output
+def checkpoint_settings(src, reference, precompute):
+    files = [(path, os.stat(path).st_size, os.stat(path).st_mtime_ns) for path in (src, reference) if path]
+    return (files, HEIGHT, LEVEL, INDEX_MODE, WINDOW, precompute)
+
+
+#writes the state of the stream to path, replacing the previous checkpoint only once the new one is complete.
+#The output is synced first, so the checkpoint never points past what is on disk
+def save_checkpoint(path, settings, position, buffer, journal):
+    writer = output_file.state()
+    output_file.file.flush()
+    os.fsync(output_file.file.fileno())
+    state = {"settings": settings, "position": position, "buffer": buffer, "journal": journal,
+             "offset": output_file.file.tell(), "writer": writer}
+    with open(path + ".tmp", "wb") as file:
+        pickle.dump(state, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(path + ".tmp", path)
+
+
+#reads the checkpoint at path, None if there is none
+def load_checkpoint(path, settings):
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as file:
+        state = pickle.load(file)
+    if state["settings"] != settings:
+        raise ValueError("checkpoint " + path + " was taken with other settings or input files")
+    return state
+
+
+#sets up a match worker. Forked workers inherit the parent's suffix index, spawned ones build their own
+def start_match_worker(file_path, settings, reference_path=None):
+    global CONTENT, TREE
+    if TREE is None:
+        start_worker(file_path, settings, reference_path)
+        CONTENT = primed_input()
+        TREE = suffix_index(CONTENT)
+
+
+#finds the longest earlier match of grid points start to end, each step positions apart from position first,
+#in a worker. Returns their lengths, absolute sources and kinds (1 for palindromes), and the worker's stats
+def match_shard(job):
+    start, end, step, first = job
+    reset_stats()
+    lengths = np.zeros(end - start, dtype=np.int64)
+    sources = np.zeros(end - start, dtype=np.int64)
+    kinds = np.zeros(end - start, dtype=np.uint8)
+    for k in range(start, end):
+        i = first + k * step
+        positions, length, kind = longest_factor_or_palindrome(i)
+        if length:
+            lengths[k - start] = length
+            sources[k - start] = positions[0] if kind == "factor" else i - positions[0]
+            kinds[k - start] = kind == "palindrome"
+    return lengths, sources, kinds, ENCODER_STATS
+
+
+#stage one of the two-stage parse. Every match only depends on the finished suffix index, so the grid
+#is split into shards that are searched in a process pool. The arrays are kept in CACHE when there is one
+def precompute_matches(file_path, step, workers=None, first=0, reference_path=None):
+    if CACHE is not None:
+        key = CACHE.key(sequence_bytes(CONTENT), matches=step, first=first)
+        arrays = CACHE.load(key)
+        if arrays is None:
+            arrays = dict(zip(("lengths", "sources", "kinds"), search_matches(file_path, step, workers, first, reference_path)))
+            CACHE.store(key, arrays)
+        return arrays["lengths"], arrays["sources"], arrays["kinds"]
+    return search_matches(file_path, step, workers, first, reference_path)
 
-    finished_time=time.time()
-    print(json.dumps({
-    "total_compression_time": round(finished_time - start_time, 3),
-    "tree_creation_time": round(tree_created_time - start_time, 3),
-    "compressor_time": round(finished_time - tree_created_time, 3),
-    "tree_memory":tree_memory,
-}))
+
+#searches every step-th position from first over shards in a process pool, returns (lengths, sources, kinds)
+def search_matches(file_path, step, workers=None, first=0, reference_path=None):
+    points = -(-(len(CONTENT) - first) // step)
+    shard = max(1, -(-points // (4 * (workers or os.cpu_count() or 1))))
+    jobs = [(k, min(k + shard, points), step, first) for k in range(0, points, shard)]
+    settings = worker_settings(CACHE.directory if CACHE else None)
+    lengths = np.zeros(points, dtype=np.int64)
+    sources = np.zeros(points, dtype=np.int64)
+    kinds = np.zeros(points, dtype=np.uint8)
+    with ProcessPoolExecutor(max_workers=workers, initializer=start_match_worker, initargs=(file_path, settings, reference_path)) as pool:
+        for (start, end, _, _), (shard_lengths, shard_sources, shard_kinds, shard_stats) in zip(jobs, pool.map(match_shard, jobs)):
+            lengths[start:end] = shard_lengths
+            sources[start:end] = shard_sources
+            kinds[start:end] = shard_kinds
+            if ENCODER_STATS:
+                ENCODER_STATS.merge(shard_stats)
+    return lengths, sources, kinds
+
+
+#stage two: token at i from the precomputed matches of every step-th position from first. Off the grid,
+#the match of the grid point before i still holds from i on, shifted by the distance to it
+def precomputed_process(i, matches, step, first=0):
+    lengths, sources, kinds = matches
+    point = (i - first) // step
+    shift = i - first - point * step
+    length = int(lengths[point]) - shift
+    if length > 0:
+        source = int(sources[point]) + shift
+        if kinds[point]:
+            return timed_encode_factor(([i - source], length, "palindrome"), i) #relative positioning
+        return timed_encode_factor(([source], length, "factor"), i)
+    return (bases_code(CONTENT[i]), "base", 1)
+
+
+#compresses bases start to end of SEQUENCE in a worker, primed with REFERENCE and, after the first block,
+#the first dictionary bases of SEQUENCE. Returns the stream with the CRC32 of the block's bases, index build time,
+#memory and the block's stats
+def compress_block(job):
+    start, end, dictionary = job
+    reset_stats()
+    start_time = time.time()
+    dictionary = dictionary if start else 0
+    bases = memoryview(sequence_bytes(SEQUENCE))
+    prepare(join_sequences(sequence_bytes(REFERENCE), bases[:dictionary], bases[start:end]), BitWriter(io.BytesIO()))
+    tree_time = time.time() - start_time
+    tree_memory = get_memory_usage()
+    encode_content(len(REFERENCE) + dictionary)
+    return output_file.file.getvalue(), checksum(sequence_bytes(SEQUENCE)[start:end]), tree_time, tree_memory, ENCODER_STATS
+
+
+#splits SEQUENCE into block_size blocks and compresses them in a process pool. Every block after the first
+#is primed with the first dictionary bases of the container, which the decompressor gets from the first block.
+#Workers map the input themselves, so only block boundaries are sent to them
+def compress_blocks(container, file_path, block_size, workers=None, reference_path=None):
+    jobs = [(k, min(k + block_size, len(SEQUENCE)), container.dictionary) for k in range(0, len(SEQUENCE), block_size)]
+    settings = worker_settings()
+    tree_time = 0
+    tree_memory = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=start_worker, initargs=(file_path, settings, reference_path)) as pool:
+        for (start, end, _), (data, crc, block_tree_time, block_memory, block_stats) in zip(jobs, pool.map(compress_block, jobs)):
+            container.add_block(data, end - start, crc)
+            if ENCODER_STATS:
+                ENCODER_STATS.merge(block_stats)
+            tree_time = max(tree_time, block_tree_time)
+            tree_memory = max(tree_memory, block_memory)
+    return tree_time, tree_memory
+
+
+def compress(src, dst, height=HEIGHT, level=LEVEL, index_mode=INDEX_MODE, window=WINDOW,
+             block_size=BLOCK_SIZE, block_dictionary=BLOCK_DICTIONARY, workers=WORKERS, precompute=PRECOMPUTE,
+             cache_dir=INDEX_CACHE, reference=REFERENCE_FILE, encoded_text=None, stats=None, checkpoint=CHECKPOINT,
+             resume=False):
+    """
+    Compresses a cleaned DNA file into a biocompress container.
+
+    Args:
+        src (str): Path to the cleaned .txt of A, C, G and T.
+        dst (str): Path of the .bin to write.
+        height (int, optional): Length of the indexed k-mers. Defaults to config.HEIGHT.
+        level (str, optional): Search level from config.LEVELS. Defaults to config.LEVEL.
+        index_mode (str, optional): "kmer", "tree" or "suffix". Defaults to config.INDEX_MODE.
+        window (int, optional): Positions of history factors may reach back, None for all. Defaults to config.WINDOW.
+        block_size (int, optional): Bases per independently compressed block, None for a single stream. Defaults to config.BLOCK_SIZE.
+        block_dictionary (int, optional): Leading bases every block is primed with. Defaults to config.BLOCK_DICTIONARY.
+        workers (int, optional): Processes used for blocks or match precomputation, None for every core. Defaults to config.WORKERS.
+        precompute (int, optional): Find the longest match of every precompute-th position with the suffix engine in
+            workers processes, then parse serially. None searches while parsing. Defaults to config.PRECOMPUTE.
+        cache_dir (str, optional): Directory the suffix index and precomputed matches are cached in, None to
+            always rebuild them. Blocks are not cached. Defaults to config.INDEX_CACHE.
+        reference (str, optional): Path to a cleaned reference .txt every stream is primed with, so factors can
+            point into it. The same reference is needed to decompress. Defaults to config.REFERENCE_FILE.
+        encoded_text (str, optional): Path that also receives the bits as '0'/'1' text, single streams only. Defaults to None.
+        stats (bool, optional): Also time the encoder stages and count tokens, see EncoderStats. None reads config.STATS
+            when called. Defaults to None.
+        checkpoint (float, optional): Seconds between checkpoints of the encoder state to dst + ".checkpoint", single
+            streams only. None takes none. Defaults to config.CHECKPOINT.
+        resume (bool, optional): Continue from the checkpoint of an interrupted run with the same settings and input,
+            if there is one. Defaults to False.
+
+    Returns:
+        dict: total_compression_time, tree_creation_time, compressor_time, tree_memory and the index cache hits and misses,
+            plus EncoderStats.metrics() when stats is set.
+    """
+    if precompute and (block_size or window):
+        raise ValueError("PRECOMPUTE needs a single stream without WINDOW")
+    if (checkpoint is not None or resume) and (block_size or encoded_text):
+        raise ValueError("checkpoints need a single stream without ENCODED_TEXT")
+    start_time = time.time()
+    configure(height, level, index_mode, window, cache_dir, stats)
+    try:
+        open_input(src, reference)
+        checkpoint_path = dst + ".checkpoint"
+        settings = checkpoint_settings(src, reference, precompute)
+        resumed = load_checkpoint(checkpoint_path, settings) if resume else None
+        dictionary = min(block_dictionary or 0, block_size) if block_size else 0
+        container = ContainerWriter(open(dst, "r+b" if resumed else "wb"), block_size or 0, dictionary, sequence_bytes(REFERENCE),
+                                    height, level)
+        if resumed: #drop whatever was written after the checkpoint
+            container.file.seek(resumed["offset"])
+            container.file.truncate()
+        if block_size and SEQUENCE:
+            tree_time, tree_memory = compress_blocks(container, src, block_size, workers, reference)
+            tree_created_time = start_time + tree_time
+        else:
+            debug_file = open(encoded_text, "w", encoding="utf-8") if encoded_text else None
+            offset = len(MAGIC) #a single stream starts right after it, also when the file was reopened to resume
+            if precompute:
+                configure(height, level, "suffix", window, cache_dir, stats)
+            prepare(primed_input(), BitWriter(container.file, text_file=debug_file))
+            if resumed:
+                output_file.restore(resumed["writer"])
+            save = (lambda position, buffer, journal: save_checkpoint(checkpoint_path, settings, position, buffer, journal)) \
+                if checkpoint is not None else None
+            tree_created_time = time.time()
+            tree_memory = get_memory_usage()
+            first = len(REFERENCE)
+            if precompute:
+                matches = precompute_matches(src, precompute, workers, first, reference)
+                encode_content(first, lambda i: precomputed_process(i, matches, precompute, first), save, checkpoint, resumed)
+            else:
+                encode_content(first, process, save, checkpoint, resumed)
+            container.end_block(offset, len(SEQUENCE), checksum(sequence_bytes(SEQUENCE)))
+            if debug_file:
+                debug_file.close()
+        container.close()
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+        finished_time=time.time()
+        metrics = {
+            "total_compression_time": round(finished_time - start_time, 3),
+            "tree_creation_time": round(tree_created_time - start_time, 3),
+            "compressor_time": round(finished_time - tree_created_time, 3),
+            "tree_memory":tree_memory,
+            "index_cache_hits": CACHE.hits if CACHE else 0,
+            "index_cache_misses": CACHE.misses if CACHE else 0,
+        }
+        if ENCODER_STATS:
+            metrics.update(ENCODER_STATS.metrics())
+        return metrics
+    finally:
+        release()
+
+
+#usage: python compressor.py [--resume], --resume continues from the checkpoint of an interrupted run
+def main():
+    output_path = DNA_FILE_PATH + DNA_FILE + "_" + str(HEIGHT)
+    print(json.dumps(compress(DNA_FILE_PATH + DNA_FILE_TXT, output_path + ".bin",
+                              encoded_text=output_path + "_encoded.txt" if ENCODED_TEXT else None,
+                              resume="--resume" in sys.argv[1:])))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
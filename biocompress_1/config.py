@@ -3,8 +3,36 @@ DNA_FILE_PATH = "../dnazip/data/chr/"
 DNA_FILE_TXT = DNA_FILE + ".txt"
 DNA_FILE_FA = DNA_FILE + ".fa"
 COMPLEMENT_TABLE = str.maketrans("ACTG", "TGAC")
+COMPLEMENT_BYTES = bytes.maketrans(b"ACTG", b"TGAC")
+PACKED_BASES = False # preprocessor also writes the cleaned bases 2 bits each to <DNA_FILE>.2bit
 HEIGHT = 11
 COMPARE_LENGTH = 50
+LEVEL = "default" # compression level from LEVELS
+WINDOW = None # positions of history kept by the kmer index, None keeps the whole input
+BLOCK_SIZE = None # bases per independently compressed block, None compresses a single stream
+BLOCK_DICTIONARY = None # leading bases of the input every block is primed with, None for fully independent blocks
+WORKERS = None # processes used for blocks, None uses every core
+MAPPED_DECODE = False # decode straight into a memory map of the output file preallocated to its length, so decoder memory does not grow with the chromosome
+GENOME_MEMORY = None # bytes the chromosomes genome.py compresses at once may need together, None for no limit
+PRECOMPUTE = None # positions between longest matches precomputed in WORKERS processes before parsing, 1 for every position. None searches while parsing
+REFERENCE_FILE = None # path of a cleaned reference chromosome .txt that factors may also point into, None compresses the target alone
+INDEX_CACHE = None # directory the suffix index and precomputed matches are cached in between runs, None rebuilds them every run
+INDEX_CACHE_SIZE = 1 << 32 # bytes INDEX_CACHE may grow to before the least recently used entries are evicted
+CHECKPOINT = None # seconds between checkpoints of a single stream compression to <output>.checkpoint, None for none
+AUTOTUNE = False # choose HEIGHT and LEVEL by compressing sampled windows of the input first, see autotune.py
+AUTOTUNE_HEIGHTS = [8, 9, 10, 11, 12] # HEIGHTs the auto-tuner tries, each with every level in LEVELS
+AUTOTUNE_SAMPLES = 4 # windows sampled evenly across the input
+AUTOTUNE_SAMPLE_SIZE = 1 << 16 # bases per sampled window
+AUTOTUNE_MEMORY = None # bytes the chosen setting may need for the whole input, None for no limit
+AUTOTUNE_TOLERANCE = 0.02 # fraction the chosen setting's ratio may be above the best sampled ratio
+STATS = False # time the encoder stages and count tokens, reported with the other metrics and in data.csv
+ENCODED_TEXT = False # also write the encoded bits as '0'/'1' text to _encoded.txt for debugging
+INDEX_MODE = "kmer" # "kmer" flat array index, "tree" AGCT Node tree, "suffix" suffix array engine
 
-with open(DNA_FILE_PATH+DNA_FILE_TXT, "r") as file:
-       CONTENT = file.read()
+# max_chain: candidates examined per position, nice_length: stop searching once a match is this long,
+# max_distance: how far back candidates may lie. None means unbounded, so "best" is the exhaustive search
+LEVELS = {
+    "fast": {"max_chain": 8, "nice_length": 32, "max_distance": 1 << 20},
+    "default": {"max_chain": 128, "nice_length": 256, "max_distance": 1 << 24},
+    "best": {"max_chain": None, "nice_length": None, "max_distance": None},
+}
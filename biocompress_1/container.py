@@ -0,0 +1,238 @@
+import hashlib, shutil, struct, zlib
+from bisect import bisect_right
+
+
+MAGIC = b"BIOC"
+# byte offset of the block's stream, its size in bytes, the number of bases it decodes to and their CRC32
+BLOCK_ENTRY = struct.Struct("<QQQI")
+# offset of the block table, block count, block size (0 for a single stream), shared dictionary size,
+# length and digest of the reference every block is primed with (0 and zeros without one), and the HEIGHT
+# and level name the blocks were compressed with, which decoding doesn't need
+TRAILER = struct.Struct("<QIQQQ8sH16s4s")
+HASH_CHUNK = 1 << 20
+
+
+def reference_digest(reference):
+    """
+    Returns the 8 byte digest a container stores to recognise its reference.
+
+    Args:
+        reference: bytes-like bases of the reference.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    view = memoryview(reference)
+    for start in range(0, len(view), HASH_CHUNK):
+        digest.update(view[start:start + HASH_CHUNK])
+    return digest.digest()
+
+
+def checksum(bases, value=0):
+    """
+    Returns the CRC32 a block entry stores for its bases.
+
+    Args:
+        bases: bytes-like bases, read HASH_CHUNK at a time so a mapped file is not copied whole.
+        value (int, optional): CRC32 of the bases before these, to continue it. Defaults to 0.
+    """
+    view = memoryview(bases)
+    for start in range(0, len(view), HASH_CHUNK):
+        value = zlib.crc32(view[start:start + HASH_CHUNK], value)
+    return value
+
+
+class ContainerWriter:
+    """
+    Writes biocompress streams one after the other, then a table of where each block is.
+
+    The table and a fixed-size trailer go at the end, so a single stream can be written
+    straight to the file without knowing its size beforehand.
+
+    Args:
+        file: Binary file object to write to.
+        block_size (int, optional): Bases per block, 0 for a single stream. Defaults to 0.
+        dictionary (int, optional): Number of leading bases every block after the first is primed with. Defaults to 0.
+        reference (optional): bytes-like reference every block is primed with before the dictionary. Defaults to none.
+        height (int, optional): HEIGHT the blocks are compressed with, 0 when unknown. Defaults to 0.
+        level (str, optional): Name of the level from config.LEVELS the blocks are compressed with. Defaults to "".
+    """
+
+    def __init__(self, file, block_size=0, dictionary=0, reference=b"", height=0, level=""):
+        self.file = file
+        self.block_size = block_size
+        self.dictionary = dictionary
+        self.height = height
+        self.level = level
+        self.reference_length = len(reference)
+        self.reference_digest = reference_digest(reference) if len(reference) else bytes(8)
+        self.blocks = []
+        file.write(MAGIC)
+
+
+    def begin_block(self):
+        """
+        Returns the offset the next block starts at, for end_block.
+        """
+        return self.file.tell()
+
+
+    def end_block(self, offset, bases, crc):
+        """
+        Records the block written since begin_block, given the number of bases it decodes to and their CRC32.
+        """
+        self.blocks.append((offset, self.file.tell() - offset, bases, crc))
+
+
+    def add_block(self, data, bases, crc):
+        """
+        Writes a complete block stream.
+        """
+        offset = self.begin_block()
+        self.file.write(data)
+        self.end_block(offset, bases, crc)
+
+
+    def close(self):
+        """
+        Writes the block table and trailer and closes the file.
+        """
+        table_offset = self.file.tell()
+        for block in self.blocks:
+            self.file.write(BLOCK_ENTRY.pack(*block))
+        self.file.write(TRAILER.pack(table_offset, len(self.blocks), self.block_size, self.dictionary,
+                                     self.reference_length, self.reference_digest, self.height, self.level.encode("ascii"), MAGIC))
+        self.file.close()
+
+
+class ContainerReader:
+    """
+    Reads the block table of a container without touching the block streams.
+
+    Args:
+        data: bytes, memoryview or mmap of the whole container.
+    """
+
+    def __init__(self, data):
+        if len(data) < len(MAGIC) + TRAILER.size or data[:len(MAGIC)] != MAGIC:
+            raise ValueError("not a biocompress container")
+        table_offset, count, self.block_size, self.dictionary, self.reference_length, self.reference_digest, self.height, \
+            level, magic = TRAILER.unpack_from(data, len(data) - TRAILER.size)
+        if magic != MAGIC:
+            raise ValueError("biocompress container has no trailer")
+        self.level = level.rstrip(b"\0").decode("ascii")
+        self.data = memoryview(data)
+        self.blocks = [BLOCK_ENTRY.unpack_from(data, table_offset + k * BLOCK_ENTRY.size) for k in range(count)]
+        # base offset each block starts at, plus the total at the end
+        self.offsets = [0]
+        for block in self.blocks:
+            self.offsets.append(self.offsets[-1] + block[2])
+
+
+    def block(self, k):
+        """
+        Returns a view of the stream of block k.
+        """
+        offset, size = self.blocks[k][:2]
+        return self.data[offset:offset + size]
+
+
+    def bases(self):
+        """
+        Returns the total number of bases in the container.
+        """
+        return self.offsets[-1]
+
+
+    def check_reference(self, reference):
+        """
+        Raises ValueError unless reference is the one the container was compressed against.
+        """
+        if len(reference) != self.reference_length or (len(reference) and reference_digest(reference) != self.reference_digest):
+            if not self.reference_length:
+                raise ValueError("container was compressed without a reference")
+            raise ValueError("container was compressed against a different reference of " + str(self.reference_length) + " bases")
+
+
+    def locate(self, position):
+        """
+        Returns the index of the block holding base position.
+        """
+        return bisect_right(self.offsets, position, 0, len(self.blocks)) - 1
+
+
+GENOME_MAGIC = b"BIOG"
+# byte offset of the chromosome's container, its size in bytes, its number of bases and the length of its name,
+# which follows the entry
+CHROMOSOME_ENTRY = struct.Struct("<QQQH")
+# offset of the chromosome table and number of chromosomes
+GENOME_TRAILER = struct.Struct("<QI4s")
+
+
+class GenomeWriter:
+    """
+    Writes the containers of several chromosomes one after the other into one archive, then a table
+    of their names and where each one is.
+
+    Containers can be added in any order, the table lists them by name.
+
+    Args:
+        file: Binary file object to write to.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.chromosomes = []
+        file.write(GENOME_MAGIC)
+
+
+    def add_chromosome(self, name, source, bases):
+        """
+        Copies a complete container from the binary file object source into the archive.
+        """
+        offset = self.file.tell()
+        shutil.copyfileobj(source, self.file, HASH_CHUNK)
+        self.chromosomes.append((name, offset, self.file.tell() - offset, bases))
+
+
+    def close(self):
+        """
+        Writes the chromosome table and trailer and closes the file.
+        """
+        table_offset = self.file.tell()
+        for name, offset, size, bases in sorted(self.chromosomes):
+            encoded = name.encode("utf-8")
+            self.file.write(CHROMOSOME_ENTRY.pack(offset, size, bases, len(encoded)) + encoded)
+        self.file.write(GENOME_TRAILER.pack(table_offset, len(self.chromosomes), GENOME_MAGIC))
+        self.file.close()
+
+
+class GenomeReader:
+    """
+    Reads the chromosome table of an archive written by GenomeWriter.
+
+    Args:
+        data: bytes, memoryview or mmap of the whole archive.
+    """
+
+    def __init__(self, data):
+        if len(data) < len(GENOME_MAGIC) + GENOME_TRAILER.size or data[:len(GENOME_MAGIC)] != GENOME_MAGIC:
+            raise ValueError("not a biocompress genome archive")
+        table_offset, count, magic = GENOME_TRAILER.unpack_from(data, len(data) - GENOME_TRAILER.size)
+        if magic != GENOME_MAGIC:
+            raise ValueError("biocompress genome archive has no trailer")
+        self.data = memoryview(data)
+        # name to (offset, size, bases), in name order
+        self.chromosomes = {}
+        position = table_offset
+        for _ in range(count):
+            offset, size, bases, length = CHROMOSOME_ENTRY.unpack_from(data, position)
+            position += CHROMOSOME_ENTRY.size
+            self.chromosomes[bytes(data[position:position + length]).decode("utf-8")] = (offset, size, bases)
+            position += length
+
+
+    def container(self, name):
+        """
+        Returns a ContainerReader over the chromosome called name.
+        """
+        offset, size, _ = self.chromosomes[name]
+        return ContainerReader(self.data[offset:offset + size])
@@ -1,5 +1,3 @@
-from config import CONTENT, COMPLEMENT_TABLE
-import math
 
 
 #encodes a number with fibonaci encoding. Like binary but instead of 1248, its 12358, and ends with 1
@@ -33,10 +31,15 @@ def decode_fibonacci(num):
     return decoded
 
 
+#max length of a binary position at input position i. Palindromes are relative, so positions run up to i+1
+def position_width(i):
+    return (i + 1).bit_length()
+
+
 #encodes a number into binary, adds a 1 after the first 11 if it exists
 def encode_binary(num, i):
     binary = str(bin(num)[2:])
-    k =  math.ceil(math.log2(i))
+    k = position_width(i)
     binary = binary.zfill(k)
     index = binary.find("11")
     if index != -1: 
@@ -75,7 +78,7 @@ def binary_to_base(base):
 
 
 #converts factor into binary encoding. Returns encoding, kind, length
-def encode_factor(factor, i):
+def encode_factor(factor, i, content):
     length = factor[1]
     kind = factor[2]
     position = factor[0][0]+1
@@ -91,11 +94,7 @@ def encode_factor(factor, i):
         position_encoded=position_fibonacci
     length_encoded=encode_fibonacci(length)
     if (factor[1]*2)<=len(length_encoded+kind_encoded+position_encoded): #determines if more efficient to encode as bases instead of factor
-        if kind=="factor":
-            string = CONTENT[factor[0][0]:factor[0][0]+length]  
-        elif kind=="palindrome":
-            string = CONTENT[i-factor[0][0]:i-factor[0][0]+length] #relative positioning
-            string = string.translate(COMPLEMENT_TABLE)
+        string = content[i:i+length] #the factor or palindrome copy is exactly what follows i
         binary = ""
         for base in string:
             binary+=base_to_binary(base)
@@ -1,56 +1,39 @@
-from config import DNA_FILE, DNA_FILE_PATH, HEIGHT, COMPLEMENT_TABLE
-from converter import decode_fibonacci, decode_binary
-import math
+from config import DNA_FILE, DNA_FILE_PATH, HEIGHT, COMPLEMENT_BYTES, WORKERS, REFERENCE_FILE, MAPPED_DECODE
+from converter import position_width
+from bitstream import BitReader
+from container import ContainerReader
+from sequence import open_sequence
+from concurrent.futures import ProcessPoolExecutor
 from tqdm import tqdm
+import io, mmap
 
 
-open(DNA_FILE_PATH+ DNA_FILE + "_" + str(HEIGHT) + "_decoded.txt", "w").close()
-output_file = open(DNA_FILE_PATH+DNA_FILE + "_" + str(HEIGHT) + "_decoded.txt", "a", encoding="utf-8")
-with open(DNA_FILE_PATH+DNA_FILE + "_" + str(HEIGHT) + "_encoded.txt", "r") as file:
-    input_file = file.read()
-PAIR_TO_BASE = {"11":"A","10":"C","01":"T","00":"G"}
+#reader over the stream being decoded, set by decode_stream
+reader = None
 
-#reads chars from i until it hits 11 and returns decoded number
+#reads bits from i until it hits 11 and returns decoded number
 def parse_number(i): 
-    end = input_file.find("11", i)
-    num = input_file[i : end + 2]
-    return decode_fibonacci(num), len(num)
+    return reader.read_fibonacci(i)
 
 #reads bits from i, determines whether binary or fibonacci and returns number
 def parse_number_position(i, window):
-    k =  math.ceil(math.log2(window)) #max length of binary number
-    num = input_file[i : i + k]
-    index = num.find("11")
-    if index==-1: #if no 11, then must be binary
-        kind="binary"
-    else: 
-        num+=input_file[i+k] #read in additional bit to account for added bit
-        if num[index+2]=="0":
-            kind="fibonacci"
-            num=num[:index+2] #cut off at 11
-        else:
-            kind="binary"
-
-    if kind=="binary":
-        return decode_binary(num), len(num)
-    else:
-        return decode_fibonacci(num), len(num)+1
+    k = position_width(window) #max length of binary number
+    return reader.read_position(i, k)
     
 
-#reads in num*2 bits starting at position and converts to bases (returns a list of bases)
+#reads in num*2 bits starting at position and converts to bases (returns bytes)
 def parse_bases(num, position):
-    chunk = input_file[position : position + 2*num]
-    return [PAIR_TO_BASE[chunk[i:i+2]] for i in range(0, len(chunk), 2)]
+    return reader.read_bases(position, num)
 
 
 #reads in num factors and processes them, returns length kind and position as ints
-def parse_factors(num, position, output_draft):
-    window = len(output_draft)
+def parse_factors(num, position, output_draft, offset=0):
+    window = offset + len(output_draft)
     factors = []
     for i in range(num):
         factor_length, length = parse_number(position)
         position+=length
-        factor_kind = input_file[position]
+        factor_kind = str(reader.peek(position, 1))
         position+=1 #only 1 bit for the kind
         factor_position, length = parse_number_position(position, window)
         position+=length
@@ -60,44 +43,273 @@ def parse_factors(num, position, output_draft):
     return factors, position
 
 
-#takes in factor lengths and positions and writes correct copying to output_draft
-def decode_factors(factors, output_draft):
+#appends length bases copied from source, complemented if a table is given. An overlapping plain copy repeats
+#the bases from source on, so it rereads them from source in chunks that double every pass. A complemented one
+#only repeats every other copy distance, so it goes in chunks of the distance that only read bases already written
+def copy_bases(output_draft, source, length, table=None):
+    copied = 0
+    while copied < length:
+        if table:
+            size = min(length - copied, len(output_draft) - source - copied)
+            output_draft += output_draft[source + copied : source + copied + size].translate(table)
+        else:
+            size = min(length - copied, len(output_draft) - source)
+            output_draft += output_draft[source : source + size]
+        copied += size
+
+
+#takes in factor lengths and positions and writes correct copying to output_draft, which starts at base offset
+def decode_factors(factors, output_draft, offset=0):
     for factor in factors:
         if factor[1]=="0": #factor
-            for i in range(factor[0]):
-                output_draft.append(output_draft[factor[2]+i])
+            copy_bases(output_draft, factor[2]-offset, factor[0])
         if factor[1]=="1": #palindrome
-            length = len(output_draft)
-            for i in range(factor[0]):
-                output_draft.append(output_draft[length-factor[2]+i].translate(COMPLEMENT_TABLE)) #relative positioning
+            copy_bases(output_draft, len(output_draft)-factor[2], factor[0], COMPLEMENT_BYTES) #relative positioning
     return output_draft
 
 
-def main():
-    output_draft = []
+#writes out all but the last window bases, which are the only ones factors can still point to.
+#The first skip bases of the stream are known to the caller and not written
+def flush_history(output_draft, offset, window, output_file, skip=0):
+    if not window or len(output_draft) < 2*window:
+        return output_draft, offset
+    flushed = len(output_draft) - window
+    output_file.write(output_draft[max(0, skip-offset):flushed])
+    del output_draft[:flushed]
+    return output_draft, offset + flushed
+
+
+class MappedOutput:
+    """
+    Decoded bases of one stream kept in a writable memory map of the output file instead of a bytearray.
+
+    Indexes are those of the bytearray decode_stream otherwise builds: the history the stream is primed with,
+    then the stream's own bases, which go to the map from start on. Appending writes after the last decoded
+    base and slices are read back from the history or the map, so factor and palindrome copies resolve against
+    the file and only the pages they touch have to be in memory.
+
+    Args:
+        output: Writable mmap of the output file, preallocated to hold every base of the stream.
+        start (int, optional): Byte of output the stream's first base goes to. Defaults to 0.
+        history (optional): bytes-like bases the stream is primed with, an mmap of the reference works too. Defaults to none.
+    """
+
+    def __init__(self, output, start=0, history=b""):
+        self.output = output
+        self.start = start
+        self.end = start
+        self.history = history
+
+
+    def __len__(self):
+        return len(self.history) + self.end - self.start
+
+
+    def __getitem__(self, key):
+        start, stop, _ = key.indices(len(self))
+        primed = len(self.history)
+        if stop <= primed:
+            return bytes(self.history[start:stop])
+        mapped = self.output[self.start + max(start - primed, 0):self.start + stop - primed]
+        return bytes(self.history[start:primed]) + mapped if start < primed else mapped
+
+
+    def __iadd__(self, bases):
+        self.output[self.end:self.end + len(bases)] = bases
+        self.end += len(bases)
+        return self
+
+
+#decodes one stream into output_file. history holds the bases the stream was primed with, they are not written out.
+#With a limit, decoding stops once that many bases (history included) are known. With a MappedOutput as mapped the
+#bases go to its map instead, output_file is not used and no window of history is flushed
+def decode_stream(data, output_file, history=b"", progress=True, limit=None, mapped=None):
+    global reader
+    reader = BitReader(data)
+    output_draft = bytearray(history) if mapped is None else mapped
+    offset = 0
     kind = "bases"
-    i=0
-    length_input = len(input_file)
-    with tqdm(total=length_input, desc="Decompressing", unit="bytes") as pbar:
+    window, i = parse_number(0) #window size + 1 written by the compressor, 1 means no window
+    window -= 1
+    length_input = reader.length
+    with tqdm(total=length_input, desc="Decompressing", unit="bits", disable=not progress) as pbar:
         prev_i = 0
-        while(i<len(input_file)): #alternates between bases and factors
+        while(i<reader.length and (limit is None or offset+len(output_draft)<limit)): #alternates between bases and factors
             num, length = parse_number(i)
             i+=length
             if kind == "bases":
                 bases = parse_bases(num, i)
                 i+=num*2
                 kind="factors"
-                output_draft.extend(bases)
+                output_draft += bases
             elif kind == "factors":
-                factors, i = parse_factors(num, i, output_draft)
-                output_draft=decode_factors(factors, output_draft)
+                factors, i = parse_factors(num, i, output_draft, offset)
+                output_draft=decode_factors(factors, output_draft, offset)
+                if mapped is None and (limit is None or offset+len(output_draft)<limit):
+                    output_draft, offset = flush_history(output_draft, offset, window, output_file, len(history))
                 kind= "bases"
             pbar.update(i - prev_i)
             prev_i = i
-        # write list of bases to file as a single string and close the file
-        output_file.write("".join(output_draft))
-        output_file.close()
+    if mapped is not None:
+        return
+    # write the remaining bases to file
+    skip = max(0, len(history)-offset)
+    output_file.write(output_draft[skip:] if limit is None else output_draft[skip:limit-offset])
+
+
+#decodes one (stream, history) pair in a worker and returns the block's bases without the history,
+#or only its first limit bases
+def decode_block(job, limit=None):
+    data, history = job
+    output = io.BytesIO()
+    decode_stream(data, output, history, progress=False, limit=None if limit is None else len(history)+limit)
+    return output.getvalue()
+
+
+#history every block after the first is primed with, sent once to each decoding worker
+HISTORY = b""
+
+def set_history(history):
+    global HISTORY
+    HISTORY = history
+
+def decode_primed_block(data):
+    return decode_block((data, HISTORY))
+
+
+#decodes the first block, then every other block in a process pool, primed with the reference and the shared dictionary
+def decode_blocks(container, output_file, workers=None, reference=b""):
+    first = decode_block((container.block(0), reference))
+    output_file.write(first)
+    history = reference + first[:container.dictionary]
+    jobs = [container.block(k).tobytes() for k in range(1, len(container.blocks))]
+    with ProcessPoolExecutor(max_workers=workers, initializer=set_history, initargs=(history,)) as pool:
+        for block in tqdm(pool.map(decode_primed_block, jobs), total=len(jobs), desc="Decompressing", unit="blocks"):
+            output_file.write(block)
+
+
+#reads the reference a container was compressed against, checking it is the same one. mapped maps it instead of reading it
+def load_reference(container, reference_path, mapped=False):
+    if not container.reference_length:
+        return b""
+    if not reference_path:
+        raise ValueError("container was compressed against a reference of " + str(container.reference_length) + " bases, none given")
+    if mapped:
+        reference = open_sequence(reference_path).data
+    else:
+        with open(reference_path, "rb") as file:
+            reference = file.read()
+    container.check_reference(reference)
+    return reference
+
+
+#decodes bases start to end (end exclusive) of a container. The block table is the checkpoint list: only the
+#blocks overlapping the range are decoded, each only as far as the range needs, plus the start of the first
+#block when the others are primed with a dictionary. reference is the one load_reference returns
+def extract(container, start, end, reference=b""):
+    end = min(end, container.bases())
+    if start >= end:
+        return b""
+    first, last = container.locate(start), container.locate(end - 1)
+    offsets = container.offsets
+    limits = {k: min(end, offsets[k + 1]) - offsets[k] for k in range(first, last + 1)}
+    if container.dictionary and last:
+        limits[0] = max(limits.get(0, 0), container.dictionary)
+    decoded = {}
+    dictionary = b""
+    if 0 in limits:
+        decoded[0] = decode_block((container.block(0), reference), limits[0])
+        dictionary = decoded[0][:container.dictionary]
+    for k in range(max(first, 1), last + 1):
+        decoded[k] = decode_block((container.block(k), reference + dictionary), limits[k])
+    bases = b"".join(decoded[k] for k in range(first, last + 1))
+    skip = start - offsets[first]
+    return bases[skip:skip + end - start]
+
+
+def decompress(src, dst, workers=WORKERS, reference=REFERENCE_FILE, mapped=MAPPED_DECODE):
+    """
+    Decodes a biocompress container back into the DNA sequence.
+
+    Args:
+        src (str): Path to the .bin written by compressor.compress.
+        dst (str): Path of the decoded .txt to write.
+        workers (int, optional): Processes used for blocks, None for every core. Defaults to config.WORKERS.
+        reference (str, optional): Path to the reference .txt the container was compressed against.
+            Defaults to config.REFERENCE_FILE.
+        mapped (bool, optional): Decode straight into a memory map of dst with decode_mapped, and map the
+            reference too, so memory doesn't grow with the chromosome. Defaults to config.MAPPED_DECODE.
+
+    Raises:
+        ValueError: If the container needs a reference and it is missing or a different one.
+    """
+    with open(src, "rb") as input_file:
+        container = ContainerReader(mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ))
+        if mapped:
+            decode_mapped(container, dst, workers, load_reference(container, reference, mapped=True))
+            return
+        with open(dst, "wb") as output_file:
+            decode_container(container, output_file, workers, load_reference(container, reference))
+
+
+#decodes every block of a container into output_file, primed with history, the reference load_reference returns
+def decode_container(container, output_file, workers=WORKERS, history=b""):
+    if len(container.blocks) == 1:
+        decode_stream(container.block(0), output_file, history)
+    elif container.blocks:
+        decode_blocks(container, output_file, workers, history)
+
+
+#map of the output file and history every block after the first is primed with, in a mapped decoding worker
+OUTPUT = None
+
+def start_mapped_worker(path, history):
+    global OUTPUT
+    set_history(history)
+    with open(path, "r+b") as output_file:
+        OUTPUT = mmap.mmap(output_file.fileno(), 0)
+
+#decodes one block in a worker straight into its bases of the output map
+def decode_mapped_block(job):
+    data, start = job
+    decode_stream(data, None, HISTORY, progress=False, mapped=MappedOutput(OUTPUT, start, HISTORY))
+    OUTPUT.flush()
+
+
+def decode_mapped(container, dst, workers=WORKERS, history=b""):
+    """
+    Decodes every block of a container straight into a memory map of the output file.
+
+    The file is preallocated to the number of bases in the block table and each block is decoded into its
+    own range of the map through a MappedOutput, so factor copies read earlier bases back from the file
+    instead of from a bytearray of the whole chromosome. The decoder's memory stays at the pages being
+    copied, which the kernel writes back and evicts as needed. The first block is decoded here, the others
+    in a process pool whose workers map the same file, primed with history and the shared dictionary.
+
+    Args:
+        container (ContainerReader): Container to decode.
+        dst (str): Path of the decoded .txt to write.
+        workers (int, optional): Processes used for blocks, None for every core. Defaults to config.WORKERS.
+        history (optional): bytes-like reference the blocks are primed with, as load_reference returns it.
+    """
+    with open(dst, "w+b") as output_file:
+        output_file.truncate(container.bases())
+        if not container.bases():
+            return
+        output = mmap.mmap(output_file.fileno(), 0)
+    decode_stream(container.block(0), None, history, progress=len(container.blocks) == 1, mapped=MappedOutput(output, 0, history))
+    if len(container.blocks) > 1:
+        jobs = [(container.block(k).tobytes(), container.offsets[k]) for k in range(1, len(container.blocks))]
+        initargs = (dst, bytes(history) + output[:container.dictionary])
+        with ProcessPoolExecutor(max_workers=workers, initializer=start_mapped_worker, initargs=initargs) as pool:
+            for _ in tqdm(pool.map(decode_mapped_block, jobs), total=len(jobs), desc="Decompressing", unit="blocks"):
+                pass
+    output.close()
+
+
+def main():
+    decompress(DNA_FILE_PATH+DNA_FILE + "_" + str(HEIGHT) + ".bin", DNA_FILE_PATH+DNA_FILE + "_" + str(HEIGHT) + "_decoded.txt")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,94 @@
+import json, time
+from collections import Counter
+from codec import binary_code, fibonacci_code
+
+
+TIMERS = ("find_factor", "extended_search", "encode_factor", "write_buffer")
+HISTOGRAMS = ("factor_lengths", "hit_kinds", "position_codes", "literal_runs", "candidates")
+
+
+#power of two bucket a length falls in, so long matches and runs don't give one histogram entry each
+def length_bucket(length):
+    return 1 << (length.bit_length() - 1)
+
+
+class EncoderStats:
+    """
+    Counters, stage timers and histograms of one compression, only collected when asked for.
+
+    Timers add up perf_counter seconds spent in each stage of TIMERS. In block and precompute mode
+    they are summed over every worker, so they are CPU seconds rather than wall time. Lengths and
+    literal runs are counted in power of two buckets, keyed by the bucket's lower bound.
+    """
+
+    def __init__(self):
+        self.times = dict.fromkeys(TIMERS, 0.0)
+        self.histograms = {name: Counter() for name in HISTOGRAMS}
+        self.positions = 0
+        self.candidate_count = 0
+
+
+    def add_time(self, stage, started):
+        """
+        Adds the time since started, a perf_counter value, to stage.
+        """
+        self.times[stage] += time.perf_counter() - started
+
+
+    def add_search(self, factor, palindrome):
+        """
+        Records one position's lookup, given the (positions, length) result of each strand.
+        """
+        candidates = len(factor[0] or ()) + len(palindrome[0] or ())
+        self.positions += 1
+        self.candidate_count += candidates
+        self.histograms["candidates"][candidates] += 1
+
+
+    def add_token(self, token, factor, i):
+        """
+        Records the token encode_factor made at position i out of factor ([position], length, kind).
+        A match cheaper to store as bases is counted as a "short" hit.
+        """
+        if token[1] == "base":
+            self.histograms["hit_kinds"]["short"] += 1
+            return
+        self.histograms["hit_kinds"][token[1]] += 1
+        self.histograms["factor_lengths"][length_bucket(token[2])] += 1
+        position = factor[0][0] + 1
+        #the same choice encode_factor makes
+        code = "binary" if binary_code(position, i)[1] < fibonacci_code(position)[1] + 1 else "fibonacci"
+        self.histograms["position_codes"][code] += 1
+
+
+    def add_literal_run(self, length):
+        """
+        Records a run of bases written as one block.
+        """
+        self.histograms["literal_runs"][length_bucket(length)] += 1
+
+
+    def merge(self, other):
+        """
+        Adds the stats of a worker to these.
+        """
+        for stage, seconds in other.times.items():
+            self.times[stage] += seconds
+        for name, histogram in other.histograms.items():
+            self.histograms[name].update(histogram)
+        self.positions += other.positions
+        self.candidate_count += other.candidate_count
+
+
+    def metrics(self):
+        """
+        Returns:
+            dict: <stage>_time for every timer, positions_searched, candidates_per_position, and every
+            histogram as a JSON object string so it fits in one data.csv column.
+        """
+        metrics = {stage + "_time": round(seconds, 3) for stage, seconds in self.times.items()}
+        metrics["positions_searched"] = self.positions
+        metrics["candidates_per_position"] = round(self.candidate_count / self.positions, 3) if self.positions else 0
+        for name, histogram in self.histograms.items():
+            metrics[name] = json.dumps({str(key): histogram[key] for key in sorted(histogram)})
+        return metrics
@@ -0,0 +1,18 @@
+from config import DNA_FILE, DNA_FILE_PATH, HEIGHT, REFERENCE_FILE
+from container import ContainerReader
+from decompressor import extract, load_reference
+import mmap, sys
+
+
+#prints bases START to END (0-based, END exclusive) of the compressed DNA_FILE, decoding only the blocks they are in
+#usage: python extract.py START END
+def main():
+    start, end = int(sys.argv[1]), int(sys.argv[2])
+    with open(DNA_FILE_PATH + DNA_FILE + "_" + str(HEIGHT) + ".bin", "rb") as input_file:
+        container = ContainerReader(mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ))
+        reference = load_reference(container, REFERENCE_FILE)
+        sys.stdout.write(extract(container, start, end, reference).decode("ascii") + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+from config import HEIGHT, LEVEL, INDEX_MODE, WINDOW, WORKERS, GENOME_MEMORY, MAPPED_DECODE
+from compressor import compress
+from container import GenomeReader, GenomeWriter
+from decompressor import decode_container, decode_mapped
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import glob, json, mmap, os, sys, tempfile, time
+
+
+#resident memory of a worker before it builds an index
+PROCESS_MEMORY = 100 << 20
+
+
+#largest amount of memory compressing length bases can take, from the size each index grows to
+def estimate_memory(length, height=HEIGHT, index_mode=INDEX_MODE, window=WINDOW):
+    codes = sum(4 ** level for level in range(1, height + 1))
+    if index_mode == "suffix": #text and its complement, int64 sort keys while building, suffix array, inverse and segment tree
+        return PROCESS_MEMORY + 100 * length
+    if index_mode == "tree": #every Node is built up front, positions are Python ints in lists
+        return PROCESS_MEMORY + 250 * codes + 40 * length
+    if window: #ring buffer slots
+        return PROCESS_MEMORY + 4 * codes + 8 * window
+    return PROCESS_MEMORY + 4 * codes + 12 * length #leaf entries and the chains copied out when looked up
+
+
+#takes the largest pending chromosome that fits in the budget next to the running ones. With nothing running
+#the largest goes even when it alone is over budget, it could never run otherwise
+def next_chromosome(pending, running_memory, budget):
+    for k, chromosome in enumerate(pending):
+        if budget is None or not running_memory or running_memory + chromosome[3] <= budget:
+            return pending.pop(k)
+    return None
+
+
+#compresses one chromosome into its own container in a worker, returns its metrics
+def compress_chromosome(job):
+    src, dst, height, level, index_mode, window = job
+    return compress(src, dst, height=height, level=level, index_mode=index_mode, window=window, block_size=None,
+                    precompute=None, cache_dir=None, reference=None, checkpoint=None)
+
+
+def compress_genome(directory, dst, height=HEIGHT, level=LEVEL, index_mode=INDEX_MODE, window=WINDOW,
+                    workers=WORKERS, memory=GENOME_MEMORY):
+    """
+    Compresses every cleaned chromosome .txt in an assembly directory into one archive with a chromosome table.
+
+    Chromosomes are compressed as single streams in a process pool, largest first, so the largest one starts
+    straight away and the smaller ones fill the other workers around it. A chromosome only starts once its
+    estimate_memory fits in memory next to those already running. Each one runs in a fresh worker, so the
+    memory of the last is returned before the next is counted.
+
+    Args:
+        directory (str): Directory holding one cleaned .txt per chromosome, named after it.
+        dst (str): Path of the archive to write.
+        height (int, optional): Length of the indexed k-mers. Defaults to config.HEIGHT.
+        level (str, optional): Search level from config.LEVELS. Defaults to config.LEVEL.
+        index_mode (str, optional): "kmer", "tree" or "suffix". Defaults to config.INDEX_MODE.
+        window (int, optional): Positions of history factors may reach back, None for all. Defaults to config.WINDOW.
+        workers (int, optional): Chromosomes compressed at once, None for every core. Defaults to config.WORKERS.
+        memory (int, optional): Bytes the running chromosomes may need together, None for no limit. Defaults to config.GENOME_MEMORY.
+
+    Returns:
+        dict: total_compression_time, largest_chromosome_time and the compress metrics of every chromosome by name.
+    """
+    start_time = time.time()
+    pending = []
+    for path in glob.glob(os.path.join(directory, "*.txt")):
+        length = os.path.getsize(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        pending.append((name, path, length, estimate_memory(length, height, index_mode, window)))
+    pending.sort(key=lambda chromosome: chromosome[2], reverse=True)
+    slots = workers or os.cpu_count() or 1
+    archive = GenomeWriter(open(dst, "wb"))
+    chromosomes = {}
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(dst))) as temporary, \
+            ProcessPoolExecutor(max_workers=slots, max_tasks_per_child=1) as pool:
+        running = {}
+        while pending or running:
+            while pending and len(running) < slots:
+                chromosome = next_chromosome(pending, sum(job[3] for job in running.values()), memory)
+                if chromosome is None:
+                    break
+                part = os.path.join(temporary, chromosome[0] + ".bin")
+                running[pool.submit(compress_chromosome, (chromosome[1], part, height, level, index_mode, window))] = chromosome
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, _, length, _ = running.pop(future)
+                chromosomes[name] = future.result()
+                part = os.path.join(temporary, name + ".bin")
+                with open(part, "rb") as source:
+                    archive.add_chromosome(name, source, length)
+                os.remove(part)
+    archive.close()
+    return {
+        "total_compression_time": round(time.time() - start_time, 3),
+        "largest_chromosome_time": max((metrics["total_compression_time"] for metrics in chromosomes.values()), default=0),
+        "chromosomes": chromosomes,
+    }
+
+
+#decodes one chromosome of an archive into directory in a worker, straight into a map of its file when mapped
+def decompress_chromosome(job):
+    src, name, directory, mapped = job
+    path = os.path.join(directory, name + ".txt")
+    with open(src, "rb") as input_file:
+        genome = GenomeReader(mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ))
+        if mapped:
+            decode_mapped(genome.container(name), path, 1)
+            return
+        with open(path, "wb") as output_file:
+            decode_container(genome.container(name), output_file, 1)
+
+
+def decompress_genome(src, directory, workers=WORKERS, mapped=MAPPED_DECODE):
+    """
+    Decodes every chromosome of an archive into directory as <name>.txt, largest first in a process pool.
+
+    Args:
+        src (str): Path to the archive written by compress_genome.
+        directory (str): Directory the chromosomes are written to. Created if missing.
+        workers (int, optional): Chromosomes decoded at once, None for every core. Defaults to config.WORKERS.
+        mapped (bool, optional): Decode each chromosome straight into a memory map of its file, see
+            decompressor.decode_mapped. Defaults to config.MAPPED_DECODE.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with open(src, "rb") as input_file:
+        genome = GenomeReader(mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ))
+        names = sorted(genome.chromosomes, key=lambda name: genome.chromosomes[name][2], reverse=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(decompress_chromosome, [(src, name, directory, mapped) for name in names]))
+
+
+#usage: python genome.py DIRECTORY ARCHIVE compresses every chromosome in DIRECTORY,
+#python genome.py -d ARCHIVE DIRECTORY decodes them back
+def main():
+    if sys.argv[1] == "-d":
+        decompress_genome(sys.argv[2], sys.argv[3])
+    else:
+        print(json.dumps(compress_genome(sys.argv[1], sys.argv[2])))
+
+
+if __name__ == "__main__":
+    main()
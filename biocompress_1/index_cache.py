@@ -0,0 +1,93 @@
+import hashlib, os, shutil
+import numpy as np
+
+
+VERSION = 1
+HASH_CHUNK = 1 << 20
+
+
+class IndexCache:
+    """
+    Directory of match index arrays saved as .npy files, so later runs over the same input can map them
+    instead of rebuilding them.
+
+    Every entry is a subdirectory named by a hash of the input and the index parameters, with one .npy per
+    array. Entries are written under a temporary name and renamed into place, so a crashed run never leaves
+    a partial entry behind. Loading touches the entry, and the least recently used entries are removed once
+    the directory grows past max_bytes.
+
+    Args:
+        directory (str): Where the entries are kept. Created if missing.
+        max_bytes (int): Total size the entries may take up.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+
+    def key(self, content, **params):
+        """
+        Returns the entry name for content (bytes-like) indexed with params.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        view = memoryview(content)
+        for start in range(0, len(view), HASH_CHUNK):
+            digest.update(view[start:start + HASH_CHUNK])
+        digest.update(repr((VERSION, sorted(params.items()))).encode())
+        return digest.hexdigest()
+
+
+    def load(self, key):
+        """
+        Maps the arrays of an entry read-only.
+
+        Returns:
+            dict: Array name to np.memmap, or None if there is no such entry.
+        """
+        path = os.path.join(self.directory, key)
+        if not os.path.isdir(path):
+            self.misses += 1
+            return None
+        self.hits += 1
+        os.utime(path)
+        return {name[:-4]: np.load(os.path.join(path, name), mmap_mode="r")
+                for name in os.listdir(path) if name.endswith(".npy")}
+
+
+    def store(self, key, arrays):
+        """
+        Saves a dict of arrays as an entry, then evicts old entries to stay under max_bytes.
+        """
+        path = os.path.join(self.directory, key)
+        temporary = path + ".tmp" + str(os.getpid())
+        os.makedirs(temporary, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(temporary, name + ".npy"), array)
+        try:
+            os.rename(temporary, path)
+        except OSError: #another run stored the same entry first
+            shutil.rmtree(temporary, ignore_errors=True)
+        self.evict()
+
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the rest fit in max_bytes.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if ".tmp" in name or not os.path.isdir(path):
+                continue
+            size = sum(os.path.getsize(os.path.join(path, file)) for file in os.listdir(path))
+            entries.append((os.path.getmtime(path), size, path))
+        total = sum(entry[1] for entry in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
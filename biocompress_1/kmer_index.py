@@ -0,0 +1,345 @@
+from array import array
+from bisect import bisect_left
+from typing import Optional
+import numpy as np
+
+
+BASE_CODE = {"A": 0, "C": 1, "T": 2, "G": 3}
+# BASE_BYTES translates ASCII bases to their codes and anything else to 255
+BASE_BYTES = bytes(BASE_CODE.get(chr(b), 255) for b in range(256))
+# complementing a base flips the high bit of its code (A 0 <-> T 2, C 1 <-> G 3), so COMPLEMENT_MASK[level]
+# turns the code of a k-mer of that length into the code of its complement
+COMPLEMENT_MASK = [int("10" * level, 2) if level else 0 for level in range(33)]
+# positions added per round by prime, which bounds its temporary arrays
+PRIME_CHUNK = 1 << 22
+
+
+class KmerIndex:
+    """
+    Flat, array-backed replacement for the AGCT tree.
+
+    Every prefix of a segment is packed 2 bits per base into an integer k-mer code,
+    which indexes straight into the array of its level instead of walking Node objects.
+    Levels below the height keep the first position seen, like the internal nodes of
+    the tree. The leaf level keeps every position as a chain through the entry arrays.
+    Stored values are offset by 1 so that 0 means empty.
+
+    With a window, only the last window positions can be returned. Lower levels keep the
+    newest position instead of the first, and the leaf chains are linked through a ring
+    buffer indexed by position modulo the window, so older entries are overwritten in place
+    and memory stays flat however long the input is.
+
+    Without a window, the chain of a leaf code is copied into an int array the first time it is
+    looked up. Later lookups only walk the entries added since, so each entry is walked once and
+    a lookup is a slice of that array.
+
+    Args:
+        height (int): Length of the longest k-mer stored, the equivalent of the tree height.
+        window (int, optional): Number of most recent positions kept. Defaults to all of them.
+    """
+
+    def __init__(self, height, window=None):
+        self.height = height
+        self.window = window
+        self.levels: list[Optional[np.ndarray]] = [None] * (height + 1)
+        # memoryviews of the same tables, indexing them gives plain ints much faster than NumPy scalars
+        self.views: list[Optional[memoryview]] = [None] * (height + 1)
+        self.next_position = 0
+        if window:
+            self.ring = np.zeros(window, dtype=np.uint32)
+            self.ring_view = self.ring.data
+        else:
+            self.entry_position = array("i")
+            self.entry_next = array("i")
+            # leaf code -> (entry at the head of its chain when last looked up, its positions oldest first)
+            self.chains = {}
+
+
+    def _level(self, level):
+        table = self.levels[level]
+        if table is None:
+            # zeroed pages are only committed when written, so unused codes cost no memory
+            table = np.zeros(4 ** level, dtype=np.uint32)
+            self.levels[level] = table
+            self.views[level] = table.data
+        return table
+
+
+    def create_positions(self, string, position):
+        """
+        Adds the given position under every prefix code of the string.
+
+        Args:
+            string (str): The DNA sequence to index.
+            position (int): The position of the sequence in the input.
+        """
+        code = 0
+        for level in range(1, min(self.height, len(string)) + 1):
+            base = BASE_CODE.get(string[level - 1])
+            if base is None:
+                return
+            code = (code << 2) | base
+            table = self.views[level]
+            if table is None:
+                self._level(level)
+                table = self.views[level]
+            if level == self.height and self.window:
+                self.ring_view[position % self.window] = table[code]
+                table[code] = position + 1
+            elif level == self.height:
+                self.entry_position.append(position)
+                self.entry_next.append(table[code])
+                table[code] = len(self.entry_position)
+            elif self.window or not table[code]:
+                table[code] = position + 1
+        self.next_position = max(self.next_position, position + 1)
+
+
+    def prime(self, data, start, end):
+        """
+        Adds every position from start to end at once, leaving the index exactly as calling
+        create_positions on each of them in order would.
+
+        The k-mer codes of a chunk of positions are built level by level with NumPy. Lower levels
+        take the first (or with a window the newest) position of every code, and leaf chains are
+        linked by sorting the chunk by code, so no Python code runs per position.
+
+        Args:
+            data: bytes-like object of the ASCII bases the positions refer to.
+            start (int): First position to add.
+            end (int): Position to stop before.
+        """
+        for chunk in range(start, end, PRIME_CHUNK):
+            self._prime_chunk(data, chunk, min(chunk + PRIME_CHUNK, end))
+        self.next_position = max(self.next_position, end)
+
+
+    def _prime_chunk(self, data, start, end):
+        count = end - start
+        bases = np.frombuffer(bytes(data[start:min(end + self.height - 1, len(data))]).translate(BASE_BYTES), dtype=np.uint8)
+        positions = np.arange(start, end, dtype=np.int64)
+        code = np.zeros(count, dtype=np.int64)
+        valid = np.ones(count, dtype=bool)
+        for level in range(1, self.height + 1):
+            # the base level - 1 after each position, missing past the end of data
+            column = np.full(count, 255, dtype=np.uint8)
+            available = max(0, min(count, len(bases) - level + 1))
+            column[:available] = bases[level - 1:level - 1 + available]
+            valid &= column != 255
+            if not valid.any():
+                return
+            code = (code << 2) | (column & 3)
+            selected = positions[valid]
+            codes = code[valid]
+            table = self._level(level)
+            if level == self.height:
+                self._prime_leaf(table, selected, codes)
+            elif self.window:
+                unique, newest = self._extreme_positions(level, selected, codes, np.maximum)
+                table[unique] = newest + 1
+            elif not table.all(): #once every code of a level has a position, later ones change nothing
+                unique, first = self._extreme_positions(level, selected, codes, np.minimum)
+                empty = table[unique] == 0
+                table[unique[empty]] = first[empty] + 1
+
+
+    def _extreme_positions(self, level, selected, codes, extreme):
+        # the codes that occur and the first (np.minimum) or last (np.maximum) position of each.
+        # A dense scatter over the level is much faster than sorting while the level is small
+        if 4 ** level <= len(codes):
+            empty = -1 if extreme is np.maximum else np.iinfo(np.int64).max
+            dense = np.full(4 ** level, empty, dtype=np.int64)
+            extreme.at(dense, codes, selected)
+            unique = np.flatnonzero(dense != empty)
+            return unique, dense[unique]
+        if extreme is np.maximum:
+            unique, last = np.unique(codes[::-1], return_index=True)
+            return unique, selected[::-1][last]
+        unique, first = np.unique(codes, return_index=True)
+        return unique, selected[first]
+
+
+    def _prime_leaf(self, table, selected, codes):
+        # every position links to the one before it with the same code, the first of each code to
+        # what the table held, and the table ends up pointing at the last of each code
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        starts = np.ones(len(order), dtype=bool)
+        starts[1:] = sorted_codes[1:] != sorted_codes[:-1]
+        ends = np.ones(len(order), dtype=bool)
+        ends[:-1] = starts[1:]
+        if self.window:
+            values = selected[order] + 1
+        else:
+            values = len(self.entry_position) + 1 + order
+        links = np.empty(len(order), dtype=np.int64)
+        links[1:] = values[:-1]
+        links[starts] = table[sorted_codes[starts]]
+        previous = np.empty(len(order), dtype=np.int64)
+        previous[order] = links
+        if self.window:
+            # the last position written to a slot is the one that stays there
+            slots, last = np.unique((selected % self.window)[::-1], return_index=True)
+            self.ring[slots] = previous[::-1][last]
+        else:
+            self.entry_position.frombytes(selected.astype(np.intc).tobytes())
+            self.entry_next.frombytes(previous.astype(np.intc).tobytes())
+        table[sorted_codes[ends]] = values[ends]
+
+
+    def oldest_position(self):
+        """
+        Returns the oldest position that is still inside the window.
+        """
+        if not self.window:
+            return 0
+        return max(0, self.next_position - self.window)
+
+
+    def positions(self, code, max_chain=None, min_position=0):
+        """
+        Returns the positions stored under a leaf k-mer code, oldest first.
+
+        Args:
+            code (int): The leaf k-mer code.
+            max_chain (int, optional): Keep at most this many of the newest positions. Defaults to all.
+            min_position (int, optional): Stop at positions before this one. Defaults to 0.
+        """
+        if self.window:
+            return self._window_positions(code, max_chain, max(min_position, self.oldest_position()))
+        chain = self._chain(code)
+        newest = max(0, len(chain) - max_chain) if max_chain else 0
+        return chain[bisect_left(chain, min_position, newest):].tolist()
+
+
+    def _chain(self, code):
+        # entries are only ever pushed onto the head of a chain, so walking from the head down to the
+        # head seen last time finds exactly the positions added since
+        head = self.views[self.height][code]
+        seen, chain = self.chains.get(code, (0, None))
+        if chain is not None and seen == head:
+            return chain
+        newer = array("i")
+        entry = head
+        while entry != seen:
+            newer.append(self.entry_position[entry - 1])
+            entry = self.entry_next[entry - 1]
+        newer.reverse()
+        if chain is None:
+            chain = newer
+        else:
+            chain.extend(newer)
+        self.chains[code] = (head, chain)
+        return chain
+
+
+    def _window_positions(self, code, max_chain, min_position):
+        # a ring slot is only overwritten window positions later, so every link newer than
+        # min_position still points at the entry it was written for
+        positions = []
+        ring = self.ring_view
+        entry = self.views[self.height][code]
+        while entry and len(positions) != max_chain:
+            position = entry - 1
+            if position < min_position:
+                break
+            positions.append(position)
+            entry = ring[position % self.window]
+        positions.reverse()
+        return positions
+
+
+    def find_factor(self, string, max_chain=None, min_position=0):
+        """
+        Finds the longest stored prefix of the string.
+
+        Args:
+            string (str): The DNA sequence to look up.
+            max_chain (int, optional): Keep at most this many of the newest leaf positions. Defaults to all.
+            min_position (int, optional): Drop leaf positions before this one. Defaults to 0.
+
+        Returns:
+            tuple: (positions, level) of the longest prefix found, or (None, None).
+        """
+        last_pos: Optional[list[int]] = None
+        last_level: Optional[int] = None
+
+        code = 0
+        for level in range(1, min(self.height, len(string)) + 1):
+            base = BASE_CODE.get(string[level - 1])
+            if base is None:
+                return (None, None)
+            code = (code << 2) | base
+            table = self.views[level]
+            entry = 0 if table is None else table[code]
+            if not entry or (self.window and entry - 1 < self.oldest_position()):
+                break
+            if level == self.height:
+                positions = self.positions(code, max_chain, min_position)
+                if not positions:
+                    break
+                last_pos = positions
+            else:
+                last_pos = [entry - 1]
+            last_level = level
+
+        return (last_pos, last_level)
+
+
+
+    def find_both_strands(self, string, max_chain=None, min_position=0):
+        """
+        Finds the longest stored prefix of the string and of its complement in one pass.
+
+        The codes of both strands are built from the same bases, the complement by flipping
+        bits with COMPLEMENT_MASK, so the string is only read and translated once.
+
+        Args:
+            string (str): The DNA sequence to look up.
+            max_chain (int, optional): Keep at most this many of the newest leaf positions. Defaults to all.
+            min_position (int, optional): Drop leaf positions before this one. Defaults to 0.
+
+        Returns:
+            tuple: (factor, palindrome), each what find_factor returns for the string and its complement.
+        """
+        factor = palindrome = (None, None)
+        factor_open = palindrome_open = True
+        oldest = self.oldest_position() if self.window else 0
+
+        code = 0
+        for level in range(1, min(self.height, len(string)) + 1):
+            base = BASE_CODE.get(string[level - 1])
+            if base is None:
+                return (factor if not factor_open else (None, None),
+                        palindrome if not palindrome_open else (None, None))
+            code = (code << 2) | base
+            table = self.views[level]
+            if table is None:
+                break
+            if factor_open:
+                entry = table[code]
+                if not entry or entry - 1 < oldest:
+                    factor_open = False
+                elif level == self.height:
+                    positions = self.positions(code, max_chain, min_position)
+                    if positions:
+                        factor = (positions, level)
+                    factor_open = False
+                else:
+                    factor = ([entry - 1], level)
+            if palindrome_open:
+                complement = code ^ COMPLEMENT_MASK[level]
+                entry = table[complement]
+                if not entry or entry - 1 < oldest:
+                    palindrome_open = False
+                elif level == self.height:
+                    positions = self.positions(complement, max_chain, min_position)
+                    if positions:
+                        palindrome = (positions, level)
+                    palindrome_open = False
+                else:
+                    palindrome = ([entry - 1], level)
+            if not factor_open and not palindrome_open:
+                break
+
+        return (factor, palindrome)
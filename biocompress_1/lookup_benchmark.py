@@ -0,0 +1,44 @@
+from config import DNA_FILE_PATH, DNA_FILE_TXT, HEIGHT, COMPLEMENT_TABLE, LEVEL, LEVELS
+from kmer_index import KmerIndex
+from sequence import open_sequence, sequence_bytes
+import json, time
+
+
+MAX_CHAIN = LEVELS[LEVEL]["max_chain"]
+
+
+#one find_factor call per strand, the lookup longest_factor_or_palindrome used to do
+def two_pass(index, segments):
+    for segment in segments:
+        index.find_factor(segment, MAX_CHAIN)
+        index.find_factor(segment.translate(COMPLEMENT_TABLE), MAX_CHAIN)
+
+
+def one_pass(index, segments):
+    for segment in segments:
+        index.find_both_strands(segment, MAX_CHAIN)
+
+
+#times both strand lookups of every position of the input against an index of all of them, with the
+#chain limit of LEVEL, and prints the best of repeats runs per lookup in microseconds
+def main(positions=200000, repeats=5):
+    content = open_sequence(DNA_FILE_PATH + DNA_FILE_TXT)
+    positions = min(positions, len(content))
+    index = KmerIndex(HEIGHT)
+    index.prime(sequence_bytes(content), 0, positions)
+    segments = [content[i:i+HEIGHT] for i in range(positions)]
+    results = {}
+    for name, lookup in (("two_pass", two_pass), ("one_pass", one_pass)):
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            lookup(index, segments)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name + "_us"] = round(best / positions * 1e6, 3)
+    results["speedup"] = round(results["two_pass_us"] / results["one_pass_us"], 2)
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
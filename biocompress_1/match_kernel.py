@@ -0,0 +1,53 @@
+import numpy as np
+from config import COMPLEMENT_BYTES
+from sequence import sequence_bytes
+
+
+class MatchKernel:
+    """
+    Extends matches over the bytes of CONTENT instead of one character at a time.
+
+    Blocks of doubling size are compared with a single bytes comparison, and the first
+    mismatch inside the failing block is located with one NumPy compare and argmin.
+    Complement matches complement each block of the input with one bytes.translate before comparing
+    it against the forward bases, so no complemented copy of the whole input is kept.
+
+    Args:
+        content (str or Sequence): The DNA sequence being compressed.
+    """
+
+    def __init__(self, content, first_block=16):
+        forward = sequence_bytes(content)
+        self.length = len(forward)
+        self.first_block = first_block
+        self.forward = forward
+
+
+    def extend(self, i, position, kind):
+        """
+        Counts how many bases from i match the bases from an earlier position.
+
+        Args:
+            i (int): The position being compressed.
+            position (int): The earlier position to compare against.
+            kind (str): "factor" for a direct match, "palindrome" for a complement match.
+
+        Returns:
+            int: Length of the match, stopping at the first mismatch or the end of the input.
+        """
+        reference = self.forward
+        limit = self.length - i
+        length = 0
+        block = self.first_block
+        while length < limit:
+            size = min(block, limit - length)
+            a = reference[i + length:i + length + size]
+            if kind == "palindrome":
+                a = a.translate(COMPLEMENT_BYTES)
+            b = reference[position + length:position + length + size]
+            if a != b:
+                equal = np.frombuffer(a, dtype=np.uint8) == np.frombuffer(b, dtype=np.uint8)
+                return length + int(equal.argmin())
+            length += size
+            block *= 2
+        return length
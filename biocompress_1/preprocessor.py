@@ -1,14 +1,66 @@
-from config import CONTENT, DNA_FILE, DNA_FILE_PATH
+from config import DNA_FILE, DNA_FILE_PATH, PACKED_BASES
+import numpy as np
+import os
 
 
-open(DNA_FILE_PATH + DNA_FILE + ".txt", "w").close()
-output_file = open(DNA_FILE_PATH + DNA_FILE + ".txt", "a", encoding="utf-8")
+CHUNK_SIZE = 1 << 24
+# case folding, applied after everything but the bases has been deleted
+UPPER_BASES = bytes.maketrans(b"acgt", b"ACGT")
+NOT_BASES = bytes(b for b in range(256) if b not in b"ACGTacgt")
+# 2 bit code of each cleaned base, the same codes the compressor gives bases
+BASE_CODES = bytes.maketrans(b"ACGT", bytes([3, 2, 0, 1]))
+
+
+#packs bases 4 per byte, first base in the top bits. len(bases) must be a multiple of 4
+def pack_bases(bases):
+    codes = np.frombuffer(bases.translate(BASE_CODES), dtype=np.uint8).reshape(-1, 4)
+    return (codes[:, 0] << 6 | codes[:, 1] << 4 | codes[:, 2] << 2 | codes[:, 3]).tobytes()
+
+
+def clean(src, dst, packed=None, chunk_size=CHUNK_SIZE):
+    """
+    Keeps only the A, C, G and T of a sequence file, upper-cased, reading and writing it in fixed-size chunks.
+
+    Every chunk is cleaned with a single bytes.translate, so memory stays at a few chunks however large
+    the file is. src and dst may be the same file, the output goes to a temporary file that replaces dst
+    once it is complete.
+
+    Args:
+        src (str): Path to the raw sequence.
+        dst (str): Path of the cleaned .txt to write.
+        packed (str, optional): Path that also receives the bases packed 2 bits each, 4 per byte with the
+            first in the top bits, coded like the compressor codes them. The last byte is padded with zeros,
+            the base count is the size of dst. Defaults to None.
+        chunk_size (int, optional): Bytes read at a time. Defaults to 16 MiB.
+
+    Returns:
+        int: Number of bases kept.
+    """
+    count = 0
+    pending = b"" #bases that don't fill a packed byte yet
+    with open(src, "rb") as input_file, open(dst + ".tmp", "wb") as output_file, \
+            open(packed + ".tmp" if packed else os.devnull, "wb") as packed_file:
+        while chunk := input_file.read(chunk_size):
+            bases = chunk.translate(UPPER_BASES, NOT_BASES)
+            output_file.write(bases)
+            count += len(bases)
+            if packed:
+                bases = pending + bases
+                whole = len(bases) - len(bases) % 4
+                packed_file.write(pack_bases(bases[:whole]))
+                pending = bases[whole:]
+        if pending:
+            packed_file.write(pack_bases(pending + b"G" * (4 - len(pending))))
+    os.replace(dst + ".tmp", dst)
+    if packed:
+        os.replace(packed + ".tmp", packed)
+    return count
+
 
 def main():
-    for i in CONTENT:
-        if i.upper() in ['A', 'C', 'T', 'G']:
-            output_file.write(i.upper())
-            
+    path = DNA_FILE_PATH + DNA_FILE + ".txt"
+    clean(path, path, DNA_FILE_PATH + DNA_FILE + ".2bit" if PACKED_BASES else None)
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
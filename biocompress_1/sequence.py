@@ -0,0 +1,79 @@
+import mmap, tempfile
+
+
+JOIN_CHUNK = 1 << 24 # bytes join_sequences copies at once
+
+
+class Sequence:
+    """
+    Read-only view of a cleaned DNA file through a memory map.
+
+    Indexing and slicing return str like the old CONTENT string did, but only the bases asked
+    for are decoded, so the whole chromosome never has to exist as a Python str. The pages
+    are shared through the page cache by every process that maps the same file.
+
+    Args:
+        data: bytes or mmap holding the ASCII bases.
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+
+    def __len__(self):
+        return len(self.data)
+
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.data[key].decode("ascii")
+        return chr(self.data[key])
+
+
+def open_sequence(file_path):
+    """
+    Maps a cleaned DNA file without reading it.
+
+    Args:
+        file_path (str): Path to a file of A, C, G and T only.
+
+    Returns:
+        Sequence: View over the file. An empty file gives an empty view, since it cannot be mapped.
+    """
+    with open(file_path, "rb") as file:
+        if not file.seek(0, 2):
+            return Sequence(b"")
+        return Sequence(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def sequence_bytes(content):
+    """
+    Returns the ASCII bytes of a str or the bytes-like object behind a Sequence, without copying a Sequence.
+    """
+    if isinstance(content, Sequence):
+        return content.data
+    return content.encode("ascii")
+
+
+def join_sequences(*parts):
+    """
+    Joins runs of bases into one Sequence without building them as a str.
+
+    The parts are copied a chunk at a time into an unlinked temporary file, which is then mapped,
+    so the joined bases sit in the page cache like a mapped input instead of on the Python heap.
+
+    Args:
+        *parts: bytes-like objects of ASCII bases, an mmap or a memoryview of one works too.
+
+    Returns:
+        Sequence: View over the parts one after another.
+    """
+    with tempfile.TemporaryFile() as file:
+        for part in parts:
+            with memoryview(part) as view:
+                for start in range(0, len(view), JOIN_CHUNK):
+                    file.write(view[start:start + JOIN_CHUNK])
+        if not file.tell():
+            return Sequence(b"")
+        file.flush()
+        return Sequence(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
@@ -0,0 +1,179 @@
+import numpy as np
+from config import COMPLEMENT_BYTES
+from sequence import sequence_bytes
+
+
+SEPARATOR = b"#"
+TERMINATOR = b"$"
+
+
+def build_suffix_array(text):
+    """
+    Builds the suffix array of a byte string by prefix doubling, one NumPy sort per round.
+
+    Args:
+        text (bytes): The text to index. Its last byte must be unique.
+
+    Returns:
+        np.ndarray: int32 array of suffix start positions in lexicographic order.
+    """
+    n = len(text)
+    rank = np.frombuffer(text, dtype=np.uint8).astype(np.int64)
+    sa = np.argsort(rank, kind="stable")
+    k = 1
+    while True:
+        second = np.zeros(n, dtype=np.int64)
+        second[:n - k] = rank[k:] + 1
+        key = rank * (n + 1) + second
+        sa = np.argsort(key, kind="stable")
+        sorted_key = key[sa]
+        new_rank = np.empty(n, dtype=np.int64)
+        new_rank[sa] = np.concatenate(([0], np.cumsum(sorted_key[1:] != sorted_key[:-1])))
+        rank = new_rank
+        if rank[sa[-1]] == n - 1 or k >= n:
+            break
+        k *= 2
+    return sa.astype(np.int32)
+
+
+class SuffixIndex:
+    """
+    Longest-match engine built on a suffix array over CONTENT, a separator and the complement of CONTENT.
+
+    The longest earlier match of a suffix sits next to it in suffix array order, so it is found
+    by searching outwards for the nearest suffix that starts before the current position, using
+    a min segment tree over the suffix array. Match lengths come from a galloping longest common
+    extension over the text. Complement matches use the same structure by querying the suffix
+    of the complement half, so both kinds cost O(log n) steps plus the extension.
+
+    Args:
+        content (str or Sequence): The DNA sequence to compress. The index needs its own copy of it.
+        arrays (dict, optional): The sa, isa and tree arrays of an earlier index over the same content,
+            for example mapped from an IndexCache. Built from content when not given.
+    """
+
+    def __init__(self, content, arrays=None):
+        self.length = len(content)
+        forward = bytes(sequence_bytes(content))
+        self.text = forward + SEPARATOR + forward.translate(COMPLEMENT_BYTES) + TERMINATOR
+        if arrays is None:
+            arrays = self.build_arrays()
+        self.arrays = arrays
+        self.size = len(arrays["tree"]) // 2
+        self.sa = arrays["sa"].data
+        self.isa = arrays["isa"].data
+        self.tree = arrays["tree"].data
+
+
+    def build_arrays(self):
+        """
+        Returns the suffix array of the text, its inverse and the min segment tree over it.
+        """
+        sa = build_suffix_array(self.text)
+        isa = np.empty(len(sa), dtype=np.int32)
+        isa[sa] = np.arange(len(sa), dtype=np.int32)
+
+        # leaves hold the suffix array, each parent the minimum start position below it
+        size = 1
+        while size < len(sa):
+            size *= 2
+        tree = np.full(2 * size, np.iinfo(np.int32).max, dtype=np.int32)
+        tree[size:size + len(sa)] = sa
+        level = size
+        while level > 1:
+            tree[level // 2:level] = np.minimum(tree[level:2 * level:2], tree[level + 1:2 * level:2])
+            level //= 2
+        return {"sa": sa, "isa": isa, "tree": tree}
+
+
+    def create_positions(self, string, position):
+        """
+        Every position is already in the suffix array, so there is nothing to insert.
+        """
+        return
+
+
+    def prime(self, data, start, end):
+        """
+        Every position is already in the suffix array, so there is nothing to insert.
+        """
+        return
+
+
+    def _previous_smaller(self, rank, limit):
+        tree = self.tree
+        node = rank + self.size
+        while node > 1:
+            if node & 1 and tree[node - 1] < limit:
+                node -= 1
+                while node < self.size:
+                    node = 2 * node + 1
+                    if tree[node] >= limit:
+                        node -= 1
+                return node - self.size
+            node >>= 1
+        return -1
+
+
+    def _next_smaller(self, rank, limit):
+        tree = self.tree
+        node = rank + self.size
+        while node > 1:
+            if not node & 1 and tree[node + 1] < limit:
+                node += 1
+                while node < self.size:
+                    node = 2 * node
+                    if tree[node] >= limit:
+                        node += 1
+                return node - self.size
+            node >>= 1
+        return -1
+
+
+    def extension(self, a, b):
+        """
+        Returns the length of the longest common prefix of the suffixes at a and b.
+        """
+        text = self.text
+        length = 0
+        step = 16
+        while text[a + length:a + length + step] == text[b + length:b + length + step]:
+            length += step
+            step *= 2
+        while step > 1:
+            step //= 2
+            if text[a + length:a + length + step] == text[b + length:b + length + step]:
+                length += step
+        return length
+
+
+    def _longest_earlier(self, suffix, limit):
+        rank = self.isa[suffix]
+        best_position, best_length = None, 0
+        for neighbour in (self._previous_smaller(rank, limit), self._next_smaller(rank, limit)):
+            if neighbour == -1:
+                continue
+            position = self.sa[neighbour]
+            length = self.extension(suffix, position)
+            if length > best_length or (length == best_length and length and position < best_position):
+                best_position, best_length = position, length
+        return best_position, best_length
+
+
+    def longest_match(self, i):
+        """
+        Finds the longest factor and the longest complement match starting before position i.
+
+        Args:
+            i (int): The current position in CONTENT.
+
+        Returns:
+            tuple: (positions, length, kind) like longest_factor_or_palindrome, or (None, None, None).
+        """
+        factor_position, factor_length = self._longest_earlier(i, i)
+        palindrome_position, palindrome_length = self._longest_earlier(self.length + 1 + i, i)
+        if not factor_length and not palindrome_length:
+            return (None, None, None)
+        if factor_length >= palindrome_length:
+            return ([factor_position], factor_length, "factor")
+        return ([i - palindrome_position], palindrome_length, "palindrome") #relative positioning
@@ -2,12 +2,37 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+import io
 import pytest
 import AGCT_tree
 import compressor
+from match_kernel import MatchKernel
+from bitstream import BitWriter
 
 FAKE_CONTENT = "ACGTACGT"
 TARGET_MODULES = [AGCT_tree, compressor]
+#repeats, shifted repeats and a unique run, so every kind of token turns up
+SAMPLE_UNIT = "ACGTTGCAACGTACGGTTACGTAC" * 3 + "TTACGTACGGACGGGGCAT"
+#module state of compressor a compress or configure call leaves behind
+COMPRESSOR_STATE = ("SEQUENCE", "REFERENCE", "CONTENT", "TREE", "KERNEL", "output_file", "CACHE", "ENCODER_STATS",
+                    "HEIGHT", "LEVEL", "INDEX_MODE", "WINDOW", "MAX_CHAIN", "NICE_LENGTH", "MAX_DISTANCE")
+
+@pytest.fixture(autouse=True)
+def compressor_state(monkeypatch):
+    """
+    Restore the module state of compressor after every test.
+    """
+    for name in COMPRESSOR_STATE:
+        monkeypatch.setattr(compressor, name, getattr(compressor, name))
+
+@pytest.fixture
+def sample_content():
+    """
+    Build a test chromosome of the given number of SAMPLE_UNIT copies.
+    """
+    def _build(copies: int = 4):
+        return SAMPLE_UNIT * copies
+    return _build
 
 @pytest.fixture
 def set_height(monkeypatch):
@@ -42,6 +67,16 @@ def mock_content(monkeypatch):
     """
     for module in TARGET_MODULES:
         monkeypatch.setattr(module, "CONTENT", FAKE_CONTENT, raising=False)
+    monkeypatch.setattr(compressor, "KERNEL", MatchKernel(FAKE_CONTENT))
     return FAKE_CONTENT
 
 
+
+@pytest.fixture(autouse=True)
+def output_writer(compressor_state, monkeypatch):
+    """
+    Send everything the compressor writes to an in-memory stream.
+    """
+    writer = BitWriter(io.BytesIO())
+    monkeypatch.setattr(compressor, "output_file", writer)
+    return writer
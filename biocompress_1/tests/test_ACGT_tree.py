@@ -72,3 +72,21 @@ def test_find_factor_not_found(fresh_tree):
     result = AGCT_tree.find_factor("GT", tree)
     assert result[0] is None
     assert result[1] == None
+
+def test_find_factor_bounded_chain(fresh_tree):
+    tree = fresh_tree(2)
+    for pos in range(6):
+        tree.create_positions("AC", pos)
+
+    assert AGCT_tree.find_factor("AC", tree, max_chain=2) == ([4, 5], 2)
+    assert AGCT_tree.find_factor("AC", tree, min_position=3) == ([3, 4, 5], 2)
+    assert AGCT_tree.find_factor("AC", tree, min_position=6) == ([0], 1)
+
+def test_prime_matches_create_positions(fresh_tree):
+    content = "ACGTTGCAACGTACGG"
+    primed = fresh_tree(3)
+    primed.prime(content.encode(), 0, len(content))
+    inserted = AGCT_tree.create_tree(3)
+    for position in range(len(content)):
+        inserted.create_positions(content[position:position+3], position)
+    assert primed == inserted
@@ -0,0 +1,45 @@
+import biocompress
+import compressor
+from autotune import autotune, choose, sample_windows
+from container import ContainerReader
+
+def candidate(height, time, memory, ratio):
+    return {"height": height, "level": "default", "estimated_compression_time": time,
+            "estimated_memory": memory, "estimated_ratio": ratio}
+
+def test_sample_windows_spread_over_input():
+    assert sample_windows(100, 4, 50) == [(0, 100)]
+    assert sample_windows(1000, 3, 100) == [(0, 100), (450, 550), (900, 1000)]
+
+def test_choose_fastest_within_memory_and_tolerance():
+    candidates = [candidate(8, 5.0, 100, 0.30), candidate(10, 3.0, 200, 0.25), candidate(12, 1.0, 900, 0.25),
+                  candidate(9, 2.0, 150, 0.40)]
+    assert choose(candidates, 500, 0.1)["height"] == 10
+    assert choose(candidates, 500, 0.7)["height"] == 9
+    assert choose(candidates, None, 0.1)["height"] == 12
+    assert choose(candidates, 50, 0.1)["height"] == 8
+
+def test_autotune_records_choice(tmp_path, monkeypatch, sample_content):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "chr.txt").write_text(sample_content(20))
+    tuned = autotune(str(tmp_path / "chr.txt"), heights=[4, 6], samples=3, sample_size=200)
+    assert len(tuned["candidates"]) == 2 * len(compressor.LEVELS)
+    assert (tuned["height"], tuned["level"]) in [(c["height"], c["level"]) for c in tuned["candidates"]]
+    assert not [path for path in tmp_path.iterdir() if path.name != "chr.txt"]
+
+    monkeypatch.setattr(biocompress, "autotune", lambda *args, **kwargs: dict(tuned))
+    row = biocompress.run_pipeline("chr", str(tmp_path) + "/", record=False, tune=True)
+    assert (row["tree_height"], row["level"]) == (tuned["height"], tuned["level"])
+    assert row["estimated_ratio"] == tuned["estimated_ratio"] and "candidates" not in row
+    with open(tmp_path / ("chr_" + str(tuned["height"]) + ".bin"), "rb") as file:
+        header = ContainerReader(file.read())
+    assert (header.height, header.level) == (tuned["height"], tuned["level"])
+
+def test_autotune_tree_ratios_match_kmer(tmp_path, set_height, sample_content):
+    set_height(4) #tune above the HEIGHT the modules were loaded with
+    (tmp_path / "chr.txt").write_text(sample_content(20))
+    ratios = {}
+    for index_mode in ("kmer", "tree"):
+        tuned = autotune(str(tmp_path / "chr.txt"), heights=[4, 6], index_mode=index_mode, samples=3, sample_size=200)
+        ratios[index_mode] = [(c["height"], c["level"], c["estimated_ratio"]) for c in tuned["candidates"]]
+    assert ratios["tree"] == ratios["kmer"]
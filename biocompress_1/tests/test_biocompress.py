@@ -0,0 +1,30 @@
+import csv
+from biocompress import print_metrics, run_sweep
+
+def test_sweep_writes_a_row_per_height(tmp_path, monkeypatch, set_height, sample_content):
+    content = sample_content()
+    set_height(4) #sweep above the HEIGHT the modules were loaded with, forked workers inherit it
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "chr.txt").write_text(content)
+    sizes = {}
+    for index_mode in ("kmer", "tree", "suffix"):
+        rows = run_sweep([6, 4], "chr", str(tmp_path) + "/", index_mode=index_mode, sweep_workers=2)
+        assert [row["tree_height"] for row in rows] == [6, 4]
+        sizes[index_mode] = [row["encoded_file_size"] for row in rows]
+        for height in (4, 6):
+            assert (tmp_path / ("chr_" + str(height) + "_decoded.txt")).read_text() == content
+    assert sizes["tree"] == sizes["kmer"]
+    with open(tmp_path / "data.csv", newline="") as file:
+        table = list(csv.DictReader(file))
+    assert [(row["tree_height"], row["index_mode"]) for row in table] == \
+        [("6", "kmer"), ("4", "kmer"), ("6", "tree"), ("4", "tree"), ("6", "suffix"), ("4", "suffix")]
+
+def test_print_metrics_rotates_other_header(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data.csv").write_text("genome,tree_height\nchr,11\n")
+    (tmp_path / "data.1.csv").write_text("older\n")
+    print_metrics({"genome": "chr", "tree_height": 4})
+    print_metrics({"genome": "chr", "tree_height": 6})
+    assert (tmp_path / "data.2.csv").read_text() == "genome,tree_height\nchr,11\n"
+    with open(tmp_path / "data.csv", newline="") as file:
+        assert [row["tree_height"] for row in csv.DictReader(file)] == ["4", "6"]
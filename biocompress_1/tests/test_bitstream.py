@@ -0,0 +1,70 @@
+from bitstream import BitReader, BitWriter, read_bit_string
+from converter import base_to_binary, encode_binary, encode_fibonacci, position_width
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "out.bin"
+    bits = "1101" * 50 + "0" * 13 + "1"
+    writer = BitWriter(open(path, "wb"), chunk_size=4)
+    for k in range(0, len(bits), 7):
+        writer.write(bits[k:k+7])
+    writer.close()
+    assert read_bit_string(path) == bits
+    assert path.stat().st_size == len(bits) // 8 + 1
+
+def test_write_bits_and_padding(tmp_path):
+    path = tmp_path / "out.bin"
+    writer = BitWriter(open(path, "wb"))
+    writer.write_bits(0b101, 3)
+    writer.write("0000")
+    writer.close()
+    assert path.read_bytes() == bytes([0b10100001])
+    assert writer.bits_written == 7
+
+def test_text_mirror(tmp_path):
+    text_path = tmp_path / "out.txt"
+    writer = BitWriter(open(tmp_path / "out.bin", "wb"), text_file=open(text_path, "w"))
+    writer.write("0110")
+    writer.close()
+    assert text_path.read_text() == "0110"
+
+def test_empty_stream(tmp_path):
+    path = tmp_path / "out.bin"
+    BitWriter(open(path, "wb")).close()
+    assert read_bit_string(path) == ""
+
+def write_stream(tmp_path, bits):
+    path = tmp_path / "stream.bin"
+    writer = BitWriter(open(path, "wb"))
+    writer.write(bits)
+    writer.close()
+    return BitReader(path.read_bytes())
+
+def test_reader_length_and_peek(tmp_path):
+    reader = write_stream(tmp_path, "1011001110")
+    assert reader.length == 10
+    assert reader.peek(2, 5) == 0b11001
+    assert reader.peek(8, 4) == 0b1000
+
+def test_read_fibonacci(tmp_path):
+    values = [1, 2, 3, 4, 7, 12, 100, 4181, 10 ** 9]
+    reader = write_stream(tmp_path, "".join(encode_fibonacci(v) for v in values) + "0" * 70)
+    position = 0
+    for value in values:
+        decoded, used = reader.read_fibonacci(position)
+        assert decoded == value
+        assert used == len(encode_fibonacci(value))
+        position += used
+
+def test_read_position(tmp_path):
+    for i, value in [(40, 3), (40, 27), (1000, 999), (1000, 6), (1 << 20, 12345), (7, 8)]:
+        width = position_width(i)
+        binary, fibonacci = encode_binary(value, i), encode_fibonacci(value) + "0"
+        # same choice as encode_factor
+        code = binary if len(binary) < len(fibonacci) else fibonacci
+        reader = write_stream(tmp_path, code + "1101")
+        assert reader.read_position(0, width) == (value, len(code))
+
+def test_read_bases(tmp_path):
+    bases = "ACGTTGCAAGT"
+    reader = write_stream(tmp_path, "1" + "".join(base_to_binary(b) for b in bases))
+    assert reader.read_bases(1, len(bases)) == bases.encode()
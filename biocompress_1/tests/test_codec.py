@@ -0,0 +1,53 @@
+import random
+import numpy as np
+import codec, converter
+
+def bits(code):
+    return format(code[0], "0" + str(code[1]) + "b")
+
+def test_fibonacci_matches_converter():
+    for num in list(range(1, 300)) + [codec.SMALL_CODES - 1, codec.SMALL_CODES, 10 ** 9, 2 ** 40 + 7]:
+        assert bits(codec.fibonacci_code(num)) == converter.encode_fibonacci(num)
+        assert codec.fibonacci_value(*codec.fibonacci_code(num)) == num
+
+def test_binary_matches_converter():
+    for i in (0, 1, 6, 7, 100, 1023, 1 << 30):
+        for num in range(1, min(i + 2, 300)):
+            assert bits(codec.binary_code(num, i)) == converter.encode_binary(num, i)
+            assert codec.binary_value(codec.binary_code(num, i)[0]) == converter.decode_binary(converter.encode_binary(num, i))
+
+def test_encode_factor_matches_converter():
+    generator = random.Random(1)
+    content = "".join(generator.choice("ACGT") for _ in range(3000))
+    for _ in range(2000):
+        length = generator.randrange(1, 40)
+        i = generator.randrange(1, len(content) - length)
+        factor = ([generator.randrange(i)], length, generator.choice(("factor", "palindrome")))
+        expected = converter.encode_factor(factor, i, content)
+        token = codec.encode_factor(factor, i, content)
+        assert (bits(token[0]),) + token[1:] == expected
+
+def test_batch_codes_match_single_codes():
+    generator = random.Random(2)
+    values = np.array([0, 1, 2, 3] + [generator.randrange(1, 1 << 40) for _ in range(500)])
+    starts = values + np.array([generator.randrange(100) for _ in values])
+    codes, widths = codec.fibonacci_codes(values)
+    assert [(int(c), int(w)) for c, w in zip(codes, widths)] == [codec.fibonacci_code(int(v)) for v in values]
+    assert (codec.fibonacci_values(codes, widths)[1:] == values[1:]).all()
+    codes, widths = codec.binary_codes(values, starts)
+    assert [(int(c), int(w)) for c, w in zip(codes, widths)] == [codec.binary_code(int(v), int(s)) for v, s in zip(values, starts)]
+    assert (codec.binary_values(codes) == values).all()
+
+def test_encode_factors_matches_encode_factor():
+    generator = random.Random(3)
+    content = "A" * 5000
+    starts = [generator.randrange(1, 4000) for _ in range(500)]
+    positions = [generator.randrange(i) for i in starts]
+    lengths = [generator.randrange(1, 500) for _ in starts]
+    kinds = [generator.random() < 0.5 for _ in starts]
+    codes, widths, bases = codec.encode_factors(positions, lengths, kinds, starts)
+    for k, i in enumerate(starts):
+        token = codec.encode_factor(([positions[k]], lengths[k], "palindrome" if kinds[k] else "factor"), i, content)
+        assert (token[1] == "base") == bases[k]
+        if not bases[k]:
+            assert token[0] == (codes[k], widths[k])
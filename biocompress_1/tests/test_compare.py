@@ -0,0 +1,9 @@
+from compare import first_mismatch
+
+def test_first_mismatch(tmp_path):
+    original = tmp_path / "original.txt"
+    original.write_text("ACGT" * 100)
+    for decoded, expected in (("ACGT" * 100, None), ("ACGT" * 60 + "ACGA" + "ACGT" * 39, 243),
+                              ("ACGT" * 50, 200), ("", 0)):
+        (tmp_path / "decoded.txt").write_text(decoded)
+        assert first_mismatch(str(original), str(tmp_path / "decoded.txt"), chunk_size=64) == expected
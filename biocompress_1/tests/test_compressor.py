@@ -3,25 +3,33 @@ from pathlib import Path
 # Ensure project root (biocompress_1) is first on sys.path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+import json
+import pytest
+import compressor
+import config
+import decompressor
+from codec import encode_factor
 from compressor import encode, process
+from decompressor import decompress
+from sequence import Sequence
 
 def test_encode_with_empty_buffer():
-    processed = ("11", "base", 1)
+    processed = ((0b11, 2), "base", 1)
     buffer = []
     result = encode(processed, buffer)
     # It should start a new buffer with the processed item
     assert result == [processed]
 
 def test_encode_with_matching_kinds():
-    processed = ("10", "base", 1)
-    buffer = [("11", "base", 1), ("00", "base", 1)]
+    processed = ((0b10, 2), "base", 1)
+    buffer = [((0b11, 2), "base", 1), ((0b00, 2), "base", 1)]
     result = encode(processed, buffer)
     # It should append to the existing buffer
-    assert result == [("11", "base", 1), ("00", "base", 1), ("10", "base", 1)]
+    assert result == [((0b11, 2), "base", 1), ((0b00, 2), "base", 1), ((0b10, 2), "base", 1)]
 
 def test_encode_with_different_kinds():
-    processed = ("11011", "factor", 5)
-    buffer = [("11", "base", 1), ("01", "base", 1)]
+    processed = ((0b11011, 5), "factor", 5)
+    buffer = [((0b11, 2), "base", 1), ((0b01, 2), "base", 1)]
     result = encode(processed, buffer)
     # It should start a new buffer with the processed item
     assert result == [processed]
@@ -33,4 +41,77 @@ def test_process_factor_empty_tree(mock_content, fresh_tree, monkeypatch):
     print(tree.a_branch.positions)
     print(tree.a_branch.c_branch.positions)
     assert tree.a_branch.positions == [0]
-    assert processed == ("11", "base", 1)
+    assert processed == ((0b11, 2), "base", 1)
+
+def test_block_round_trip(monkeypatch):
+    dictionary = "ACGTTGCAACGTACGGTTACGTAC" * 3
+    block = "TTACGTACGGAC" + dictionary[5:40] + "GGGGCAT" + dictionary[::-1]
+    monkeypatch.setattr(compressor, "SEQUENCE", Sequence((dictionary + block).encode()))
+    data = compressor.compress_block((len(dictionary), len(dictionary) + len(block), len(dictionary)))[0]
+    assert decompressor.decode_block((data, dictionary.encode())) == block.encode()
+
+def test_compress_round_trip(tmp_path, sample_content):
+    content = sample_content()
+    (tmp_path / "chr.txt").write_text(content)
+    for height, level, precompute in ((4, "fast", None), (6, "best", None), (4, "default", 3)):
+        metrics = compressor.compress(str(tmp_path / "chr.txt"), str(tmp_path / "chr.bin"), height=height, level=level,
+                                      workers=1, precompute=precompute)
+        assert compressor.HEIGHT == height and compressor.MAX_CHAIN == compressor.LEVELS[level]["max_chain"]
+        assert compressor.TREE is None and compressor.SEQUENCE is None and compressor.output_file is None
+        assert metrics["total_compression_time"] >= 0
+        decompress(str(tmp_path / "chr.bin"), str(tmp_path / "decoded.txt"))
+        assert (tmp_path / "decoded.txt").read_text() == content
+
+def test_precomputed_process_shifts_grid_match(monkeypatch):
+    content = "ACGTACGTAC"
+    monkeypatch.setattr(compressor, "CONTENT", content)
+    lengths, sources, kinds = [0, 6, 0], [0, 0, 0], [0, 0, 0]
+    assert compressor.precomputed_process(5, (lengths, sources, kinds), 4) == encode_factor(([1], 5, "factor"), 5, content)
+    assert compressor.precomputed_process(8, (lengths, sources, kinds), 4)[1] == "base"
+
+def test_compress_stats(tmp_path, sample_content):
+    (tmp_path / "chr.txt").write_text(sample_content())
+    plain = compressor.compress(str(tmp_path / "chr.txt"), str(tmp_path / "plain.bin"), height=4)
+    assert "find_factor_time" not in plain
+    metrics = compressor.compress(str(tmp_path / "chr.txt"), str(tmp_path / "stats.bin"), height=4, stats=True)
+    assert (tmp_path / "stats.bin").read_bytes() == (tmp_path / "plain.bin").read_bytes()
+    hits = json.loads(metrics["hit_kinds"])
+    runs = json.loads(metrics["literal_runs"])
+    assert metrics["positions_searched"] == sum(json.loads(metrics["candidates"]).values()) > 0
+    assert sum(json.loads(metrics["position_codes"]).values()) == hits.get("factor", 0) + hits.get("palindrome", 0)
+    assert sum(json.loads(metrics["factor_lengths"]).values()) == hits.get("factor", 0) + hits.get("palindrome", 0)
+    assert runs and all(int(bucket) & (int(bucket) - 1) == 0 for bucket in runs)
+    assert metrics["find_factor_time"] >= 0 and metrics["write_buffer_time"] >= 0
+
+def test_config_stats_default(tmp_path, monkeypatch, sample_content):
+    (tmp_path / "chr.txt").write_text(sample_content())
+    monkeypatch.setattr(config, "STATS", True)
+    metrics = compressor.compress(str(tmp_path / "chr.txt"), str(tmp_path / "chr.bin"), height=4)
+    assert "find_factor_time" in metrics
+
+def test_resume_from_checkpoint(tmp_path, monkeypatch, sample_content):
+    content = sample_content() + "GATTACA" * 9
+    src, dst = str(tmp_path / "chr.txt"), str(tmp_path / "chr.bin")
+    (tmp_path / "chr.txt").write_text(content)
+    for index_mode in ("kmer", "tree"):
+        compressor.compress(src, str(tmp_path / "plain.bin"), height=4, index_mode=index_mode)
+        def interrupted(i):
+            if i > len(content) // 2:
+                raise KeyboardInterrupt
+            return process(i)
+        monkeypatch.setattr(compressor, "process", interrupted)
+        with pytest.raises(KeyboardInterrupt):
+            compressor.compress(src, dst, height=4, index_mode=index_mode, checkpoint=0)
+        monkeypatch.setattr(compressor, "process", process)
+        with pytest.raises(ValueError):
+            compressor.compress(src, dst, height=5, index_mode=index_mode, resume=True)
+        compressor.compress(src, dst, height=4, index_mode=index_mode, resume=True)
+        assert (tmp_path / "chr.bin").read_bytes() == (tmp_path / "plain.bin").read_bytes()
+        assert not (tmp_path / "chr.bin.checkpoint").exists()
+
+def test_tree_matches_kmer_above_config_height(tmp_path, set_height, sample_content):
+    set_height(4) #compress above the HEIGHT the modules were loaded with
+    (tmp_path / "chr.txt").write_text(sample_content() + "GATTACA" * 9)
+    for index_mode in ("kmer", "tree"):
+        compressor.compress(str(tmp_path / "chr.txt"), str(tmp_path / (index_mode + ".bin")), height=6, index_mode=index_mode)
+    assert (tmp_path / "tree.bin").read_bytes() == (tmp_path / "kmer.bin").read_bytes()
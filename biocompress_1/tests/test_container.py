@@ -0,0 +1,69 @@
+import io
+import pytest
+from container import ContainerReader, ContainerWriter
+
+class KeepOpen(io.BytesIO):
+    def close(self):
+        pass
+
+def test_round_trip():
+    file = KeepOpen()
+    writer = ContainerWriter(file, block_size=4, dictionary=2, height=11, level="default")
+    writer.add_block(b"\x01\x02", 4, 11)
+    offset = writer.begin_block()
+    file.write(b"\x03")
+    writer.end_block(offset, 3, 12)
+    writer.close()
+
+    reader = ContainerReader(file.getvalue())
+    assert reader.block_size == 4 and reader.dictionary == 2
+    assert reader.height == 11 and reader.level == "default"
+    assert bytes(reader.block(0)) == b"\x01\x02"
+    assert bytes(reader.block(1)) == b"\x03"
+    assert reader.bases() == 7
+    assert [block[3] for block in reader.blocks] == [11, 12]
+
+def test_rejects_other_files():
+    with pytest.raises(ValueError, match="not a biocompress container"):
+        ContainerReader(b"not a container at all, just some bytes")
+
+def test_locate_blocks():
+    file = KeepOpen()
+    writer = ContainerWriter(file, block_size=4)
+    for bases in (4, 4, 2):
+        writer.add_block(b"\x00", bases, 0)
+    writer.close()
+
+    reader = ContainerReader(file.getvalue())
+    assert reader.offsets == [0, 4, 8, 10]
+    assert [reader.locate(position) for position in (0, 3, 4, 9, 10)] == [0, 0, 1, 2, 2]
+
+def test_reference_check():
+    file = KeepOpen()
+    ContainerWriter(file, reference=b"ACGT").close()
+    reader = ContainerReader(file.getvalue())
+    assert reader.reference_length == 4
+    reader.check_reference(b"ACGT")
+    for other in (b"ACGA", b""):
+        with pytest.raises(ValueError, match="different reference of 4 bases"):
+            reader.check_reference(other)
+
+def test_genome_table():
+    from container import GenomeReader, GenomeWriter
+    containers = {}
+    for name, bases in (("chr2", 3), ("chr10", 5)):
+        file = KeepOpen()
+        writer = ContainerWriter(file)
+        writer.add_block(name.encode(), bases, 0)
+        writer.close()
+        containers[name] = file.getvalue()
+    archive = KeepOpen()
+    writer = GenomeWriter(archive)
+    for name, data in containers.items():
+        writer.add_chromosome(name, io.BytesIO(data), 0)
+    writer.close()
+
+    reader = GenomeReader(archive.getvalue())
+    assert list(reader.chromosomes) == ["chr10", "chr2"]
+    for name in containers:
+        assert bytes(reader.container(name).block(0)) == name.encode()
@@ -0,0 +1,83 @@
+import io
+import mmap
+import pytest
+import compressor
+from config import COMPLEMENT_BYTES
+from container import ContainerReader, ContainerWriter
+from decompressor import MappedOutput, copy_bases, decompress, extract
+from sequence import Sequence
+
+class KeepOpen(io.BytesIO):
+    def close(self):
+        pass
+
+def build_container(monkeypatch, content, block_size, dictionary):
+    monkeypatch.setattr(compressor, "SEQUENCE", Sequence(content.encode()))
+    file = KeepOpen()
+    writer = ContainerWriter(file, block_size, dictionary)
+    for k in range(0, len(content), block_size):
+        end = min(k + block_size, len(content))
+        data, crc = compressor.compress_block((k, end, dictionary))[:2]
+        writer.add_block(data, end - k, crc)
+    writer.close()
+    return ContainerReader(file.getvalue())
+
+def test_extract_ranges(monkeypatch, sample_content):
+    content = sample_content()
+    container = build_container(monkeypatch, content, 50, 20)
+    for start, end in ((0, 10), (45, 55), (60, 200), (0, len(content)), (300, 400), (10, 10)):
+        assert extract(container, start, end) == content[start:end].encode()
+
+def test_extract_single_stream(monkeypatch, sample_content):
+    content = sample_content()
+    container = build_container(monkeypatch, content, len(content), 0)
+    assert extract(container, 30, 90) == content[30:90].encode()
+
+def test_reference_round_trip(tmp_path, sample_content):
+    content = sample_content()
+    reference = content[::-1] + content
+    target = content[40:200] + "GATTACA" + content[230:]
+    (tmp_path / "ref.txt").write_text(reference)
+    (tmp_path / "chr.txt").write_text(target)
+    for block_size in (None, 100):
+        compressor.compress(str(tmp_path / "chr.txt"), str(tmp_path / "chr.bin"), height=5, block_size=block_size,
+                            block_dictionary=10, workers=1, reference=str(tmp_path / "ref.txt"))
+        decompress(str(tmp_path / "chr.bin"), str(tmp_path / "decoded.txt"), workers=1, reference=str(tmp_path / "ref.txt"))
+        assert (tmp_path / "decoded.txt").read_text() == target
+    with pytest.raises(ValueError, match="different reference"):
+        decompress(str(tmp_path / "chr.bin"), str(tmp_path / "decoded.txt"), reference=str(tmp_path / "chr.txt"))
+
+def test_mapped_output_reads_across_history():
+    output = mmap.mmap(-1, 8)
+    draft = MappedOutput(output, 2, b"ACG")
+    draft += b"TTA"
+    assert len(draft) == 6 and output[:6] == b"\0\0TTA\0"
+    assert draft[1:5] == b"CGTT" and draft[0:2] == b"AC" and draft[4:6] == b"TA"
+
+def test_mapped_round_trip(tmp_path, sample_content):
+    (tmp_path / "ref.txt").write_text(sample_content()[::-1] + sample_content())
+    for content in (sample_content(), ""):
+        (tmp_path / "chr.txt").write_text(content)
+        for block_size, dictionary, window, reference in ((None, None, None, None), (None, None, 60, None),
+                                                         (100, None, None, None), (100, 30, None, None),
+                                                         (None, None, None, "ref.txt"), (100, 30, None, "ref.txt")):
+            reference = str(tmp_path / reference) if reference else None
+            compressor.compress(str(tmp_path / "chr.txt"), str(tmp_path / "chr.bin"), height=5, window=window,
+                                block_size=block_size, block_dictionary=dictionary, workers=1, reference=reference)
+            decompress(str(tmp_path / "chr.bin"), str(tmp_path / "decoded.txt"), workers=1, reference=reference, mapped=True)
+            assert (tmp_path / "decoded.txt").read_text() == content
+
+def test_copy_bases_overlapping():
+    for source, length in ((3, 1000), (1, 7), (0, 2), (2, 1)):
+        expected = bytearray(b"ACGT")
+        for k in range(length):
+            expected.append(expected[source + k])
+        draft = bytearray(b"ACGT")
+        copy_bases(draft, source, length)
+        assert draft == expected
+        expected = bytearray(b"ACGT")
+        for k in range(length):
+            expected += bytes([expected[source + k]]).translate(COMPLEMENT_BYTES)
+        draft = bytearray(b"ACGT")
+        copy_bases(draft, source, length, COMPLEMENT_BYTES)
+        assert draft == expected
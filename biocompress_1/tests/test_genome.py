@@ -0,0 +1,29 @@
+from genome import compress_genome, decompress_genome, estimate_memory, next_chromosome
+
+def test_next_chromosome_fits_budget():
+    pending = [("chr1", "", 300, 30), ("chr2", "", 200, 20), ("chr3", "", 100, 10)]
+    assert next_chromosome(pending, 0, 15)[0] == "chr1"
+    assert next_chromosome(pending, 50, 65)[0] == "chr3"
+    assert next_chromosome(pending, 50, 65) is None
+    assert next_chromosome(pending, 50, None)[0] == "chr2"
+
+def test_estimate_grows_with_length_and_height():
+    assert estimate_memory(2000, 11) > estimate_memory(1000, 11) > estimate_memory(1000, 8)
+
+def test_genome_round_trip(tmp_path, sample_content):
+    assembly = tmp_path / "assembly"
+    assembly.mkdir()
+    chromosomes = {
+        "chr1": sample_content(6),
+        "chr2": "GATTACA" * 20,
+        "chrX": "",
+    }
+    for name, content in chromosomes.items():
+        (assembly / (name + ".txt")).write_text(content)
+    metrics = compress_genome(str(assembly), str(tmp_path / "genome.bin"), height=4, workers=2, memory=1)
+    assert sorted(metrics["chromosomes"]) == sorted(chromosomes)
+    assert not [name for name in (tmp_path).iterdir() if name.name.startswith("tmp")]
+    for mapped in (False, True):
+        decompress_genome(str(tmp_path / "genome.bin"), str(tmp_path / "decoded"), workers=2, mapped=mapped)
+        for name, content in chromosomes.items():
+            assert (tmp_path / "decoded" / (name + ".txt")).read_text() == content
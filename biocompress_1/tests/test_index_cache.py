@@ -0,0 +1,34 @@
+import os
+import numpy as np
+from index_cache import IndexCache
+from suffix_index import SuffixIndex
+
+def test_store_and_load(tmp_path):
+    cache = IndexCache(str(tmp_path), 1 << 20)
+    key = cache.key(b"ACGT", index="suffix")
+    assert cache.load(key) is None
+    cache.store(key, {"sa": np.arange(5, dtype=np.int32)})
+    assert list(cache.load(key)["sa"]) == [0, 1, 2, 3, 4]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_key_depends_on_content_and_params(tmp_path):
+    cache = IndexCache(str(tmp_path), 1 << 20)
+    keys = {cache.key(b"ACGT", index="suffix"), cache.key(b"ACGA", index="suffix"), cache.key(b"ACGT", matches=4)}
+    assert len(keys) == 3
+
+def test_evicts_least_recently_used(tmp_path):
+    array = np.zeros(1000, dtype=np.int64)
+    cache = IndexCache(str(tmp_path), 2 * array.nbytes + 500)
+    for name, age in (("old", 100), ("new", 0)):
+        cache.store(name, {"a": array})
+        os.utime(tmp_path / name, (1000 - age, 1000 - age))
+    cache.store("newest", {"a": array})
+    assert sorted(os.listdir(tmp_path)) == ["new", "newest"]
+
+def test_suffix_index_from_cached_arrays(tmp_path):
+    content = "ACGTTGCAACGTACGGTTACGTAC"
+    cache = IndexCache(str(tmp_path), 1 << 20)
+    cache.store("index", SuffixIndex(content).arrays)
+    cached = SuffixIndex(content, cache.load("index"))
+    fresh = SuffixIndex(content)
+    assert [cached.longest_match(i) for i in range(len(content))] == [fresh.longest_match(i) for i in range(len(content))]
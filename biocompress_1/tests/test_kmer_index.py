@@ -0,0 +1,112 @@
+import AGCT_tree
+from kmer_index import KmerIndex
+
+def test_create_positions_leaf():
+    index = KmerIndex(3)
+    index.create_positions("ACG", 5)
+    index.create_positions("ACG", 9)
+    assert index.find_factor("ACG") == ([5, 9], 3)
+
+def test_create_positions_partial():
+    index = KmerIndex(3)
+    index.create_positions("A", 10)
+    assert index.find_factor("AC") == ([10], 1)
+
+def test_internal_levels_keep_first_position():
+    index = KmerIndex(3)
+    index.create_positions("ACG", 0)
+    index.create_positions("ACT", 4)
+    assert index.find_factor("ACC") == ([0], 2)
+
+def test_find_factor_not_found():
+    index = KmerIndex(2)
+    index.create_positions("AC", 0)
+    assert index.find_factor("GT") == (None, None)
+
+def test_levels_allocated_lazily():
+    index = KmerIndex(4)
+    assert all(table is None for table in index.levels)
+    index.create_positions("AC", 0)
+    assert index.levels[3] is None and index.levels[4] is None
+
+def test_matches_tree(fresh_tree):
+    content = "ACGTTGCAACGTACGGTTACGTAC"
+    tree = fresh_tree(4)
+    index = KmerIndex(4)
+    for i in range(len(content)):
+        segment = content[i:i+4]
+        for query in (segment, segment[:2], "TTTT"):
+            assert index.find_factor(query) == AGCT_tree.find_factor(query, tree)
+        tree.create_positions(segment, i)
+        index.create_positions(segment, i)
+
+def test_find_factor_bounded_chain():
+    index = KmerIndex(2)
+    for position in range(6):
+        index.create_positions("AC", position)
+    assert index.find_factor("AC", max_chain=2) == ([4, 5], 2)
+    assert index.find_factor("AC", min_position=3) == ([3, 4, 5], 2)
+
+def test_find_factor_chain_out_of_range():
+    index = KmerIndex(2)
+    index.create_positions("AC", 0)
+    assert index.find_factor("AC", min_position=1) == ([0], 1)
+
+def test_window_evicts_old_positions():
+    index = KmerIndex(2, window=3)
+    for position in range(6):
+        index.create_positions("AC", position)
+    assert index.oldest_position() == 3
+    assert index.find_factor("AC") == ([3, 4, 5], 2)
+    assert index.ring.shape == (3,)
+
+def test_window_evicts_lower_levels():
+    index = KmerIndex(2, window=2)
+    index.create_positions("GT", 0)
+    index.create_positions("AC", 1)
+    index.create_positions("AC", 2)
+    assert index.find_factor("GA") == (None, None)
+    assert index.find_factor("AG") == ([2], 1)
+
+def test_prime_matches_create_positions():
+    content = "ACGTTGCAACGTACGGTTACGTACNNACGTTTACGTTG"
+    for window in (None, 5):
+        primed = KmerIndex(4, window)
+        inserted = KmerIndex(4, window)
+        for position in range(3):
+            primed.create_positions(content[position:position+4], position)
+            inserted.create_positions(content[position:position+4], position)
+        primed.prime(content.encode(), 3, len(content))
+        for position in range(3, len(content)):
+            inserted.create_positions(content[position:position+4], position)
+        for level in range(1, 5):
+            assert list(primed.levels[level]) == list(inserted.levels[level])
+        if window:
+            assert list(primed.ring) == list(inserted.ring)
+        else:
+            assert primed.entry_position == inserted.entry_position
+            assert primed.entry_next == inserted.entry_next
+        assert primed.next_position == inserted.next_position
+
+def test_find_both_strands_matches_two_lookups():
+    content = "ACGTTGCAACGTACGGTTACGTACNNACGTTTACGTTGCATGCA"
+    complement = str.maketrans("ACGT", "TGCA")
+    for window in (None, 6):
+        index = KmerIndex(4, window)
+        index.prime(content.encode(), 0, len(content))
+        for position in range(len(content) - 3):
+            segment = content[position:position+4]
+            for max_chain, min_position in ((None, 0), (2, 5)):
+                assert index.find_both_strands(segment, max_chain, min_position) == \
+                    (index.find_factor(segment, max_chain, min_position),
+                     index.find_factor(segment.translate(complement), max_chain, min_position))
+
+def test_chain_catches_up_with_new_positions():
+    index = KmerIndex(2)
+    index.prime(b"ACACAC", 0, 5)
+    assert index.find_factor("AC") == ([0, 2, 4], 2)
+    for position in (6, 8):
+        index.create_positions("AC", position)
+    assert index.find_factor("AC") == ([0, 2, 4, 6, 8], 2)
+    assert index.find_factor("AC", max_chain=2, min_position=7) == ([8], 2)
+    assert index.find_factor("AC", max_chain=2, min_position=9) == ([0], 1)
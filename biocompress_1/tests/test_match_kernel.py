@@ -0,0 +1,27 @@
+from config import COMPLEMENT_TABLE
+from match_kernel import MatchKernel
+
+CONTENT = "ACGTACGTACGTTTTTTTTTTTTTTTTTTTTTTTTTTTTTTTTTTTTAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAGCA"
+
+def brute_force(content, i, position, kind):
+    length = 0
+    while i + length < len(content):
+        base = content[i + length]
+        if kind == "palindrome":
+            base = base.translate(COMPLEMENT_TABLE)
+        if base != content[position + length]:
+            break
+        length += 1
+    return length
+
+def test_extend_matches_brute_force():
+    kernel = MatchKernel(CONTENT, first_block=2)
+    for i in range(len(CONTENT)):
+        for position in range(i):
+            for kind in ("factor", "palindrome"):
+                assert kernel.extend(i, position, kind) == brute_force(CONTENT, i, position, kind)
+
+def test_extend_to_end_of_input():
+    kernel = MatchKernel("ACACACACAC")
+    assert kernel.extend(2, 0, "factor") == 8
+    assert kernel.extend(10, 0, "factor") == 0
@@ -0,0 +1,23 @@
+import random
+from bitstream import BYTE_BASES
+from preprocessor import clean
+
+def test_clean_streams_chunks(tmp_path):
+    generator = random.Random(4)
+    raw = "".join(generator.choice("ACGTacgtNn\n>x ") for _ in range(5003))
+    expected = "".join(base.upper() for base in raw if base.upper() in "ACGT")
+    (tmp_path / "raw.txt").write_text(raw)
+    for chunk_size in (7, 64, 1 << 20):
+        count = clean(str(tmp_path / "raw.txt"), str(tmp_path / "clean.txt"), str(tmp_path / "clean.2bit"), chunk_size)
+        assert count == len(expected)
+        assert (tmp_path / "clean.txt").read_text() == expected
+        packed = (tmp_path / "clean.2bit").read_bytes()
+        assert len(packed) == -(-count // 4)
+        assert b"".join(BYTE_BASES[byte] for byte in packed)[:count] == expected.encode()
+
+def test_clean_in_place(tmp_path):
+    path = tmp_path / "chr.txt"
+    path.write_text("acgtNNAC\nGT")
+    assert clean(str(path), str(path)) == 8
+    assert path.read_text() == "ACGTACGT"
+    assert sorted(file.name for file in tmp_path.iterdir()) == ["chr.txt"]
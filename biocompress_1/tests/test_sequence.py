@@ -0,0 +1,28 @@
+import sequence
+from sequence import Sequence, open_sequence, sequence_bytes, join_sequences
+
+def test_slices_are_str(tmp_path):
+    path = tmp_path / "chr.txt"
+    path.write_bytes(b"ACGTTGCA")
+    sequence = open_sequence(str(path))
+    assert len(sequence) == 8
+    assert sequence[2:5] == "GTT"
+    assert sequence[7] == "A"
+    assert bytes(sequence_bytes(sequence)) == b"ACGTTGCA"
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert len(open_sequence(str(path))) == 0
+
+def test_str_content():
+    assert sequence_bytes("ACGT") == b"ACGT"
+    assert Sequence(b"ACGT")[1:3] == "CG"
+
+def test_join_sequences(tmp_path, monkeypatch):
+    monkeypatch.setattr(sequence, "JOIN_CHUNK", 3)
+    path = tmp_path / "chr.txt"
+    path.write_bytes(b"ACGTTGCA")
+    joined = join_sequences(b"GATTACA", memoryview(sequence_bytes(open_sequence(str(path))))[2:], b"")
+    assert joined[:] == "GATTACAGTTGCA"
+    assert len(join_sequences(b"", b"")) == 0
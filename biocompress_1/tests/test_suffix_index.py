@@ -0,0 +1,47 @@
+from config import COMPLEMENT_TABLE
+from suffix_index import SuffixIndex, build_suffix_array
+
+CONTENT = "ACGTTGCAACGTACGGTTACGTACAAAAAATTTTTGCA"
+
+def brute_force(content, i, kind):
+    target = content[i:] if kind == "factor" else content[i:].translate(COMPLEMENT_TABLE)
+    best = (None, 0)
+    for p in range(i):
+        length = 0
+        while i + length < len(content) and content[p + length] == target[length]:
+            length += 1
+        if length > best[1]:
+            best = (p, length)
+    return best
+
+def test_build_suffix_array():
+    text = b"ACGTTGCAACGTA$"
+    expected = sorted(range(len(text)), key=lambda k: text[k:])
+    assert list(build_suffix_array(text)) == expected
+
+def test_extension():
+    index = SuffixIndex(CONTENT)
+    assert index.extension(0, 8) == 4
+    assert index.extension(0, 1) == 0
+
+def test_longest_match_lengths():
+    index = SuffixIndex(CONTENT)
+    for i in range(len(CONTENT)):
+        factor = brute_force(CONTENT, i, "factor")[1]
+        palindrome = brute_force(CONTENT, i, "palindrome")[1]
+        result = index.longest_match(i)
+        assert (result[1] or 0) == max(factor, palindrome)
+
+def test_longest_match_positions():
+    index = SuffixIndex(CONTENT)
+    positions, length, kind = index.longest_match(8)
+    assert kind == "factor"
+    assert CONTENT[positions[0]:positions[0] + length] == CONTENT[8:8 + length]
+    positions, length, kind = index.longest_match(30)
+    assert kind == "palindrome"
+    start = 30 - positions[0]
+    assert CONTENT[start:start + length] == CONTENT[30:30 + length].translate(COMPLEMENT_TABLE)
+
+def test_no_match_at_start():
+    index = SuffixIndex(CONTENT)
+    assert index.longest_match(0) == (None, None, None)
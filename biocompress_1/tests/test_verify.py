@@ -0,0 +1,31 @@
+import compressor
+from container import BLOCK_ENTRY, TRAILER, ContainerReader
+from genome import compress_genome
+from verify import verify
+
+def corrupt_checksum(path, k):
+    data = bytearray(path.read_bytes())
+    table_offset = TRAILER.unpack_from(data, len(data) - TRAILER.size)[0]
+    entry = list(BLOCK_ENTRY.unpack_from(data, table_offset + k * BLOCK_ENTRY.size))
+    entry[3] ^= 1
+    BLOCK_ENTRY.pack_into(data, table_offset + k * BLOCK_ENTRY.size, *entry)
+    path.write_bytes(bytes(data))
+
+def test_verify_blocks(tmp_path, sample_content):
+    (tmp_path / "chr.txt").write_text(sample_content())
+    for block_size, dictionary in ((None, None), (100, None), (100, 30)):
+        path = tmp_path / "chr.bin"
+        compressor.compress(str(tmp_path / "chr.txt"), str(path), height=4, block_size=block_size,
+                            block_dictionary=dictionary, workers=1)
+        assert verify(str(path), workers=1) == []
+        blocks = len(ContainerReader(path.read_bytes()).blocks)
+        corrupt_checksum(path, blocks - 1)
+        assert verify(str(path), workers=1) == [(None, blocks - 1)]
+
+def test_verify_genome(tmp_path, sample_content):
+    assembly = tmp_path / "assembly"
+    assembly.mkdir()
+    for name, content in (("chr1", sample_content()), ("chr2", "GATTACA" * 20)):
+        (assembly / (name + ".txt")).write_text(content)
+    compress_genome(str(assembly), str(tmp_path / "genome.bin"), height=4, workers=1)
+    assert verify(str(tmp_path / "genome.bin"), workers=1) == []
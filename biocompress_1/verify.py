@@ -0,0 +1,111 @@
+from config import DNA_FILE, DNA_FILE_PATH, HEIGHT, WORKERS, REFERENCE_FILE
+from container import ContainerReader, GenomeReader, GENOME_MAGIC, checksum
+from decompressor import decode_block, decode_primed_block, decode_stream, load_reference, set_history
+from concurrent.futures import ProcessPoolExecutor
+import mmap, sys
+
+
+class ChecksumWriter:
+    """
+    Output file for decode_stream that keeps only the CRC32 and number of the bases written to it,
+    so a single stream is checked without holding its bases.
+    """
+
+    def __init__(self):
+        self.crc = 0
+        self.bases = 0
+
+
+    def write(self, data):
+        self.crc = checksum(data, self.crc)
+        self.bases += len(data)
+
+
+#number of bases and CRC32 of one decoded block
+def block_checksum(bases):
+    return len(bases), checksum(bases)
+
+#checks one block in a worker, primed with HISTORY. A stream too damaged to decode gives None, so it is
+#reported like any other mismatch instead of stopping the check
+def check_primed_block(data):
+    try:
+        return block_checksum(decode_primed_block(data))
+    except Exception:
+        return None
+
+
+def verify_container(container, workers=WORKERS, reference=b""):
+    """
+    Decodes every block of a container and checks it against the CRC32 and base count in its block table.
+
+    A single stream is decoded straight into a ChecksumWriter. Blocks are decoded in a process pool, each
+    worker returning only the block's checksum. When the blocks are primed with a dictionary the first block
+    is decoded first, since the others need its bases.
+
+    Args:
+        container (ContainerReader): Container to check.
+        workers (int, optional): Processes used for blocks, None for every core. Defaults to config.WORKERS.
+        reference (bytes, optional): Reference the container was compressed against, as load_reference returns it.
+
+    Returns:
+        list: Indexes of the blocks that don't decode to their checksum, empty when all of them do.
+    """
+    if len(container.blocks) == 1:
+        output = ChecksumWriter()
+        try:
+            decode_stream(container.block(0), output, reference, progress=False)
+            results = [(output.bases, output.crc)]
+        except Exception:
+            results = [None]
+    elif container.dictionary:
+        first = decode_block((container.block(0), reference))
+        results = [block_checksum(first)]
+        jobs = [container.block(k).tobytes() for k in range(1, len(container.blocks))]
+        with ProcessPoolExecutor(max_workers=workers, initializer=set_history, initargs=(reference + first[:container.dictionary],)) as pool:
+            results += pool.map(check_primed_block, jobs)
+    else:
+        jobs = [container.block(k).tobytes() for k in range(len(container.blocks))]
+        with ProcessPoolExecutor(max_workers=workers, initializer=set_history, initargs=(reference,)) as pool:
+            results = list(pool.map(check_primed_block, jobs))
+    return [k for k, (block, result) in enumerate(zip(container.blocks, results)) if result != (block[2], block[3])]
+
+
+def verify(src, workers=WORKERS, reference=REFERENCE_FILE):
+    """
+    Checks every block of a biocompress container, or of every chromosome of a genome archive, against its checksum.
+
+    Args:
+        src (str): Path to a .bin written by compressor.compress or genome.compress_genome.
+        workers (int, optional): Processes used for blocks, None for every core. Defaults to config.WORKERS.
+        reference (str, optional): Path to the reference .txt a container was compressed against.
+            Defaults to config.REFERENCE_FILE.
+
+    Returns:
+        list: (chromosome, block) of every block that doesn't match, chromosome None outside a genome archive.
+
+    Raises:
+        ValueError: If src is not a container or archive, or the reference it needs is missing or a different one.
+    """
+    with open(src, "rb") as input_file:
+        data = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if data[:len(GENOME_MAGIC)] == GENOME_MAGIC:
+            genome = GenomeReader(data)
+            return [(name, k) for name in genome.chromosomes for k in verify_container(genome.container(name), workers)]
+        container = ContainerReader(data)
+        return [(None, k) for k in verify_container(container, workers, load_reference(container, reference))]
+
+
+#usage: python verify.py [FILE], checks the default compressed chromosome when no FILE is given.
+#Exits with 1 when a block doesn't match
+def main():
+    src = sys.argv[1] if len(sys.argv) > 1 else DNA_FILE_PATH + DNA_FILE + "_" + str(HEIGHT) + ".bin"
+    failed = verify(src)
+    for name, k in failed:
+        print(("" if name is None else name + " ") + "block " + str(k) + ": NOT MATCHING")
+    if failed:
+        sys.exit(1)
+    print("MATCHING")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,12 @@
 import os
+import struct
+
+
+# Trailer after the encoded chromosomes: one CHECKSUM_ENTRY per chromosome followed by its name,
+# then the size of those entries, their count and CHECKSUM_MAGIC
+CHECKSUM_MAGIC   = b"DZCK"
+CHECKSUM_ENTRY   = struct.Struct("<IB")
+CHECKSUM_TRAILER = struct.Struct("<II4s")
 
 
 def writeBitVINT(num):
@@ -159,6 +167,46 @@ def export_as_binary(export_name_with_extension, bitstr):
         
 
 
+def export_checksums(export_name_with_extension, checksums):
+    """
+    Append the checksum trailer to an encoded file, after every chromosome is written.
+
+    @param:
+    * export_name_with_extension (str): destination filename (with extension)
+    * checksums (dict): chromosome name (str) to the CRC32 (int) of its variants
+    """
+    entries = b''.join(CHECKSUM_ENTRY.pack(crc, len(chr.encode())) + chr.encode() for chr, crc in checksums.items())
+    with open(export_name_with_extension, "ab") as file:
+        file.write(entries + CHECKSUM_TRAILER.pack(len(entries), len(checksums), CHECKSUM_MAGIC))
+
+
+def split_checksums(data):
+    """
+    Split the contents of an encoded file into the encoded bytes and its checksum trailer.
+
+    @param:
+    * data (bytes): the whole encoded file
+
+    @return:
+    * data (bytes): the encoded bytes without the trailer
+    * checksums (dict): chromosome name (str) to CRC32 (int), None for a file written without them
+    """
+    if len(data) < CHECKSUM_TRAILER.size or data[-4:] != CHECKSUM_MAGIC:
+        return data, None
+    size, count, _ = CHECKSUM_TRAILER.unpack(data[-CHECKSUM_TRAILER.size:])
+    start = len(data) - CHECKSUM_TRAILER.size - size
+    if start < 0:
+        return data, None
+    checksums = {}
+    position = start
+    for _ in range(count):
+        crc, length = CHECKSUM_ENTRY.unpack_from(data, position)
+        position += CHECKSUM_ENTRY.size
+        checksums[data[position:position + length].decode()] = crc
+        position += length
+    return data[:start], checksums
+
+
 def remove_file_if_exists(filepath):
     '''
     Deletes a file if it exists. Useful for files that are
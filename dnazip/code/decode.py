@@ -38,8 +38,8 @@ def readBinFile(file_to_bin_file):
     """
     # Open file in binary read mode
     with open(file_to_bin_file, 'rb') as f:
-        # Read all binary data from file
-        binary_data = f.read()
+        # Read all binary data from file, without the checksum trailer
+        binary_data, _ = split_checksums(f.read())
         
         # Convert binary data to string of bits
         bit_string = BytesToBitString(binary_data)
@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from constants import *
 from huffman import *
 from bitfile import *
@@ -12,6 +15,23 @@ from decode import *
 from metrics import *
 
 
+def chromosome_checksum(chr_df):
+    '''
+    CRC32 of the variants of one chromosome, taken over their CSV rows sorted the
+    way decode_file sorts them, so the input and the decoded file give the same value.
+
+    @params: 
+    * chr_df: DataFrame with the 'var_type', 'chr', 'pos' and 'var_info' of one chromosome.
+    
+    @return:
+    * (int) CRC32 of the rows.
+    '''
+    rows = chr_df[['var_type', 'chr', 'pos', 'var_info']].astype({'var_type': int, 'pos': int})
+    rows = rows.sort_values(by=['var_type', 'pos', 'var_info'])
+
+    return zlib.crc32(rows.to_csv(index=False, header=None, lineterminator='\n').encode())
+
+
 def encode_file(input_file_path, dbSNP_path, k_mer_size):
     '''
     Encoding of a variant file into a compressed binary file, 
@@ -23,7 +43,8 @@ def encode_file(input_file_path, dbSNP_path, k_mer_size):
     * k_mer_size: integer size of the k-mers.
     
     @return:
-    * None, writes the encoded outout to 'OUTPUT_BIN_PATH'.
+    * None, writes the encoded outout to 'OUTPUT_BIN_PATH', followed by the
+      chromosome_checksum of every chromosome.
     '''
     
     variants_df = pd.read_csv(input_file_path, 
@@ -33,10 +54,12 @@ def encode_file(input_file_path, dbSNP_path, k_mer_size):
     # Will contain the Huffman encoding maps for each 
     # chromosome and the number of k_mers that were encoded    
     encoding_dict = {}
+    checksums = {}
 
     for chr in CHROMOSOMES:
         # Choose current chromosome
         chr_df = variants_df.where(variants_df['chr'] == chr)
+        checksums[chr] = chromosome_checksum(variants_df[variants_df['chr'] == chr])
 
         # Variation dataframes
         snps_df = chr_df.where(chr_df['var_type'] == 0).dropna()
@@ -84,6 +107,7 @@ def encode_file(input_file_path, dbSNP_path, k_mer_size):
     
     # Export the final encoding dictionary    
     export_as_txt(TREE_PATH, encoding_dict)
+    export_checksums(OUTPUT_BIN_PATH, checksums)
 
 
 def decode_file(bit_string):
@@ -153,8 +177,62 @@ def decode_file(bit_string):
                      header=None) # type: ignore
 
 
+def verify_decoded(decoded_path, enc_file_path, workers=None):
+    '''
+    Check a decoded variant file against the checksums stored in its encoded file,
+    one chromosome per task in a process pool.
+
+    @params: 
+    * decoded_path: file path (str) to the decoded variant file.
+    * enc_file_path: file path (str) to the encoded .bin file.
+    * workers: number of processes, None for every core.
+
+    @return:
+    * failed: list of the chromosomes that don't match, empty when all do.
+    '''
+    with open(enc_file_path, 'rb') as f:
+        _, checksums = split_checksums(f.read())
+
+    if checksums is None:
+        raise ValueError(enc_file_path + " has no checksums")
+
+    decoded_df = pd.read_csv(decoded_path, 
+                             names = ['var_type', 'chr', 'pos', 'var_info'],
+                             header = None)
+    chr_dfs = [decoded_df[decoded_df['chr'] == chr] for chr in checksums]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        decoded = list(pool.map(chromosome_checksum, chr_dfs))
+
+    return [chr for chr, crc in zip(checksums, decoded) if crc != checksums[chr]]
+
+
+def print_verification(decoded_path, enc_file_path):
+    '''
+    Print whether a decoded variant file matches the checksums of its encoded file.
+
+    @return:
+    * True when every chromosome matches.
+    '''
+    failed = verify_decoded(decoded_path, enc_file_path)
+
+    for chr in failed:
+        print(chr, "NOT MATCHING")
+
+    if not failed:
+        print("MATCHING")
+
+    return not failed
+
+
 def main(): 
     
+    ##### VERIFY #####
+    # python dnazip.py verify decodes the existing encoded file and checks it
+    if sys.argv[1:] == ['verify']:
+        decode_file(readBinFile(ENC_FILE_PATH))
+        sys.exit(not print_verification(OUTPUT_DEC_PATH, ENC_FILE_PATH))
+    
     ##### ENCODE #####
     remove_file_if_exists(OUTPUT_BIN_PATH)
     remove_file_if_exists(INS_DEC_CONCAT)
@@ -195,6 +273,8 @@ def main():
     record_timings(1, 0, time_difference(end_cpu_time_decode, start_cpu_time_decode), TIME_CSV_PATH)
     record_timings(1, 1, time_difference(end_wall_time_decode, start_wall_time_decode), TIME_CSV_PATH)
 
+    print_verification(OUTPUT_DEC_PATH, ENC_FILE_PATH)
+
 
 if __name__ == "__main__":
     main()
@@ -27,6 +27,7 @@ PLOT_OUT_PATH = OUTPUT_DIR / 'plots' / 'space_savings_vs_kmer.png'
 TIME_CSV_PATH = OUTPUT_DIR / 'csv' / 'huffman_times.csv'
 GENOME_CHOICE = "Ash1_v2_CHR21"
 K_MER_TAG     = f"K_MER_{K_MER_SIZE}"
+CHECKSUM_BLOCK = 1 << 20  # characters of the genome covered by each CRC32 stored after the encoded bits
 
 if (K_MER):
     GENOME_BIN    = OUT_GENOME / f'ENCODED_{GENOME_CHOICE}_{K_MER_TAG}'
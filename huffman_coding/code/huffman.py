@@ -1,6 +1,16 @@
 import ast
+import os
+import struct
+import zlib
 from config import *
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Trailer after the encoded bits: the CRC32 of every CHECKSUM_BLOCK characters of the
+# genome, then the block size, the number of CRCs and CHECKSUM_MAGIC
+CHECKSUM_MAGIC   = b"HFCK"
+CHECKSUM_TRAILER = struct.Struct("<QI4s")
 
 
 '''
@@ -166,14 +176,51 @@ in big-endian order.
 @params: 
  * export_name - chosen filename 
  * binary_str - the encoded huffman string
+ * checksums - CRC32s from block_checksums, written after the encoded bytes
+   with a trailer that read_bin strips again.
 @return:
  * Exports a .bin file of the encoded string now as bytes to the current directory
 '''
-def export_as_binary(export_name, binary_str):
+def export_as_binary(export_name, binary_str, checksums=None):
     byte_value = int(binary_str, 2).to_bytes((len(binary_str) + 7) // 8,
                                              byteorder='big')
     with open(export_name + '.bin', "wb") as file:
         file.write(byte_value)
+        if checksums is not None:
+            file.write(struct.pack(f"<{len(checksums)}I", *checksums))
+            file.write(CHECKSUM_TRAILER.pack(CHECKSUM_BLOCK, len(checksums), CHECKSUM_MAGIC))
+
+
+'''
+CRC32 of every block of a text, as export_as_binary stores them.
+@params: 
+ * text - the original genome string.
+ * block_size - characters per block.
+@return:
+ * checksums - a list with the CRC32 of each block, the last one may be shorter.
+'''
+def block_checksums(text, block_size=CHECKSUM_BLOCK):
+    data = text.encode()
+    return [zlib.crc32(data[i:i + block_size]) for i in range(0, len(data), block_size)]
+
+
+'''
+Split the contents of a .bin file into the encoded bytes and its checksum trailer.
+@params: 
+ * data - the bytes of a .bin file.
+@return:
+ * data - the encoded bytes without the trailer.
+ * block_size, checksums - the block size and CRC32s of the trailer, or None, None
+   for a file written without one.
+'''
+def split_checksums(data):
+    if len(data) < CHECKSUM_TRAILER.size or data[-4:] != CHECKSUM_MAGIC:
+        return data, None, None
+    block_size, count, _ = CHECKSUM_TRAILER.unpack(data[-CHECKSUM_TRAILER.size:])
+    start = len(data) - CHECKSUM_TRAILER.size - 4 * count
+    if start < 0:
+        return data, None, None
+    return data[:start], block_size, list(struct.unpack(f"<{count}I", data[start:start + 4 * count]))
         
         
 '''
@@ -219,6 +266,61 @@ def append_as_txt(export_name, text):
         file.write(str(text))
 
 
+'''
+CRC32 of one block of a file, read on its own in a worker of verify_decoded.
+@params: 
+ * job - (path, start, end) of the block.
+@return:
+ * the CRC32 of the block.
+'''
+def file_block_checksum(job):
+    path, start, end = job
+    with open(path, 'rb') as file:
+        file.seek(start)
+        return zlib.crc32(file.read(end - start))
+
+
+'''
+Check a decoded genome against the checksums stored in its .bin file, one block
+at a time in a process pool, so the decoded genome is never read whole.
+@params: 
+ * decoded_path - path of the decoded genome text.
+ * filename - filename of the .bin file, without the extension.
+ * workers - number of processes, None for every core.
+@return:
+ * failed - indexes of the blocks that don't match, empty when all do. Blocks
+   missing from or added to the decoded genome count as not matching.
+'''
+def verify_decoded(decoded_path, filename, workers=None):
+    with open(filename + ".bin", 'rb') as file:
+        _, block_size, checksums = split_checksums(file.read())
+    if checksums is None:
+        raise ValueError(filename + ".bin has no checksums")
+    size = os.path.getsize(decoded_path)
+    jobs = [(decoded_path, i, min(i + block_size, size)) for i in range(0, size, block_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        decoded = list(pool.map(file_block_checksum, jobs))
+    return [k for k in range(max(len(decoded), len(checksums)))
+            if k >= len(decoded) or k >= len(checksums) or decoded[k] != checksums[k]]
+
+
+'''
+Print whether a decoded genome matches the checksums stored in its .bin file.
+@params: 
+ * decoded_path - path of the decoded genome text.
+ * filename - filename of the .bin file, without the extension.
+@return:
+ * True when every block matches.
+'''
+def print_verification(decoded_path, filename):
+    failed = verify_decoded(decoded_path, filename)
+    for k in failed:
+        print("Block", k, "NOT MATCHING")
+    if not failed:
+        print("MATCHING")
+    return not failed
+
+
 '''
 Read in binary file from bytes to bits to string. For some reason it adds a leading zero....
 @params: 
@@ -228,7 +330,7 @@ Read in binary file from bytes to bits to string. For some reason it adds a lead
 '''
 def read_bin(filename):
     with open(filename + ".bin", 'rb') as file:
-        data = file.read()
+        data, _, _ = split_checksums(file.read())
         bits = ''.join(format(byte, '08b') for byte in data)
     # Remove leading zero
     return bits[1:]        
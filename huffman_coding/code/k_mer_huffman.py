@@ -1,4 +1,5 @@
 import re
+import sys
 from config import *
 from huffman import *
 from metrics import *
@@ -105,7 +106,7 @@ def huff_encoding():
     bitstr += remainder_bitstr
     final_bitstr = k_mer_vint + bitstr
 
-    export_as_binary(str(GENOME_BIN), final_bitstr)
+    export_as_binary(str(GENOME_BIN), final_bitstr, block_checksums(sequence_data))
     
 
 def huff_decoding():
@@ -128,8 +129,16 @@ def huff_decoding():
     export_as_txt(str(DECODED_FILE), sequence)
 
 
+'''
+Run the program. With the argument 'verify', only decode the existing .bin file
+and check it against its checksums.
+'''
 def main():
     
+    if sys.argv[1:] == ['verify']:
+        huff_decoding()
+        sys.exit(not print_verification(str(DECODED_FILE) + '.txt', str(GENOME_BIN)))
+
     cpu_start, wall_start = record_current_times()
     print("Encoding:", GENOME_CHOICE)
     huff_encoding()
@@ -142,6 +151,7 @@ def main():
     cpu_end, wall_end = record_current_times()
     record_timings(1, 0, time_difference(cpu_end, cpu_start), TIME_CSV_PATH, K_MER_SIZE)
     record_timings(1, 1, time_difference(wall_end, wall_start), TIME_CSV_PATH, K_MER_SIZE)
+    print_verification(str(DECODED_FILE) + '.txt', str(GENOME_BIN))
 
 
 
@@ -66,7 +66,7 @@ def run_encode():
     final_bitstr    = length_vint + encoded_text
     
     export_as_txt(str(HUFFMAN_TREE), encoding_map)
-    export_as_binary(str(GENOME_BIN), final_bitstr)
+    export_as_binary(str(GENOME_BIN), final_bitstr, block_checksums(sequence_data))
     
 
 def run_decode():
@@ -100,6 +100,7 @@ def main():
     cpu_end, wall_end = record_current_times()
     record_timings(1, 0, time_difference(cpu_end, cpu_start), TIME_CSV_PATH, k)
     record_timings(1, 1, time_difference(wall_end, wall_start), TIME_CSV_PATH, k)
+    print_verification(str(DECODED_FILE) + '.txt', str(GENOME_BIN))
     
 
 if __name__ == "__main__":
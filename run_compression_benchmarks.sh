@@ -40,28 +40,14 @@ echo -e "${BLUE}============================================================${NC
 
 cd "$SCRIPT_DIR/biocompress_1"
 
-# Update config.py to use Ash1_v2_CHR21
-cat > config.py << 'EOF'
-DNA_FILE = "Ash1_v2_CHR21"
-DNA_FILE_PATH = "../dnazip/data/chr/"
-DNA_FILE_TXT = DNA_FILE + ".txt"
-DNA_FILE_FA = DNA_FILE + ".fa"
-COMPLEMENT_TABLE = str.maketrans("ACTG", "TGAC")
-HEIGHT = 11
-COMPARE_LENGTH = 50
-
-with open(DNA_FILE_PATH+DNA_FILE_TXT, "r") as file:
-       CONTENT = file.read()
-EOF
-
 # Copy chr21.txt to Ash1_v2_CHR21.txt for biocompress
 if [ ! -f "../dnazip/data/chr/Ash1_v2_CHR21.txt" ]; then
     echo -e "${GREEN}Creating Ash1_v2_CHR21.txt from chr21.txt...${NC}"
     cp "$CHR_FILE" "../dnazip/data/chr/Ash1_v2_CHR21.txt"
 fi
 
-echo -e "${GREEN}Running biocompress.py...${NC}"
-python3 biocompress.py
+echo -e "${GREEN}Running the biocompress pipeline...${NC}"
+python3 -c "from biocompress import run_pipeline; run_pipeline(genome='$GENOME_NAME', path='../dnazip/data/chr/')"
 
 if [ $? -eq 0 ]; then
     echo -e "${GREEN}✓ biocompress_1 completed successfully${NC}"